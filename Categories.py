@@ -0,0 +1,53 @@
+# Phrase categories and difficulty levels used by the phrase corpus
+CATEGORIES = ["general", "greetings", "courtesy", "food", "travel", "time"]
+
+DIFFICULTY_LEVELS = {
+    1: "Beginner",
+    2: "Intermediate",
+    3: "Advanced"
+}
+
+# Common phrases for practice (starter set), seeded into an empty corpus.
+# Language code -> list of (text, category, difficulty)
+STARTER_PHRASES = {
+    "ES": [
+        ("Buenos días, ¿cómo estás?", "greetings", 1),
+        ("Me gustaría un café, por favor", "food", 1),
+        ("¿Dónde está la estación de tren?", "travel", 1),
+        ("Muchas gracias por tu ayuda", "courtesy", 1),
+        ("¿Qué hora es?", "time", 1),
+        ("La comida está muy rica", "food", 1)
+    ],
+    "FR": [
+        ("Bonjour, comment allez-vous?", "greetings", 1),
+        ("Je voudrais un café, s'il vous plaît", "food", 1),
+        ("Où est la gare?", "travel", 1),
+        ("Merci beaucoup pour votre aide", "courtesy", 1),
+        ("Quelle heure est-il?", "time", 1),
+        ("La nourriture est très bonne", "food", 1)
+    ],
+    "DE": [
+        ("Guten Tag, wie geht es Ihnen?", "greetings", 1),
+        ("Ich hätte gerne einen Kaffee, bitte", "food", 1),
+        ("Wo ist der Bahnhof?", "travel", 1),
+        ("Vielen Dank für Ihre Hilfe", "courtesy", 1),
+        ("Wie spät ist es?", "time", 1),
+        ("Das Essen ist sehr lecker", "food", 1)
+    ],
+    "IT": [
+        ("Buongiorno, come stai?", "greetings", 1),
+        ("Vorrei un caffè, per favore", "food", 1),
+        ("Dov'è la stazione ferroviaria?", "travel", 1),
+        ("Grazie mille per il tuo aiuto", "courtesy", 1),
+        ("Che ora è?", "time", 1),
+        ("Il cibo è molto buono", "food", 1)
+    ],
+    "JA": [
+        ("こんにちは、お元気ですか？", "greetings", 1),
+        ("コーヒーをください", "food", 1),
+        ("駅はどこですか？", "travel", 1),
+        ("ご協力ありがとうございます", "courtesy", 1),
+        ("今何時ですか？", "time", 1),
+        ("食べ物はとても美味しいです", "food", 1)
+    ]
+}
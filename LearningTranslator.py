@@ -1,36 +1,57 @@
-import speech_recognition as sr
-import requests
 import time
-from gtts import gTTS
-import playsound
-import os
-import unicodedata
-from tempfile import NamedTemporaryFile
-from utility.config_manager import get_api_key
-import threading
-from functools import partial
-
-# DeepL API Key
-DEEPL_API_KEY = get_api_key()
+from urllib.parse import urlencode
+from io import BytesIO
+from collections import namedtuple
+from utility.config_manager import get_api_key, get_settings, TranslationMemorySettings
+from utility.translation_cache import get_translation_cache, normalize_source
+from utility.translation_memory import get_translation_memory
+from utility.audio_cache import get_audio_cache
+from utility.text_normalization import normalize
+from utility.task_executor import submit as submit_task, PRIORITY_HIGH, PRIORITY_NORMAL
+from utility.tokenization import split_sentences
+from utility.single_flight import SingleFlight
+
+# speech_recognition, gtts, playsound, pygame and requests are slow to import,
+# so they are imported where first used rather than when the app starts
+
+def get_deepl_api_key():
+    """Return the DeepL API key (the config store only rereads config.json when it changes)"""
+    return get_api_key()
+
 DEEPL_URL = "https://api-free.deepl.com/v2/translate"
 
-def translate_text(text, target_language):
+# DeepL request limits for batched translation
+DEEPL_MAX_TEXTS_PER_REQUEST = 50
+DEEPL_MAX_REQUEST_BYTES = 128 * 1024
+TRANSLATION_ERROR_PREFIX = "[Translation Error"
+
+# A translation and where it came from; see translate_text_detailed
+TranslationResult = namedtuple("TranslationResult", "text origin score")
+
+# In-flight translations and speech syntheses, shared by identical concurrent requests
+_translation_flights = SingleFlight()
+_synthesis_flights = SingleFlight()
+
+def is_translation_error(text):
+    """Return True if text is one of the error strings produced by the translators"""
+    return isinstance(text, str) and text.startswith(TRANSLATION_ERROR_PREFIX)
+
+def _request_translations(texts, target_language):
     """
-    Translate text to the target language using the DeepL API.
+    Send one DeepL request for a list of texts.
+    Returns (translations, None) on success or (None, error_message) on failure.
     """
-    # Check if API key is set
-    if not DEEPL_API_KEY:
-        print("Error: DeepL API key is not configured.")
-        return f"[Translation Error: API key not configured. Please set your DeepL API key.]"
+    import requests
+    from utility.http_client import get_http_client
     
     params = {
-        'auth_key': DEEPL_API_KEY,
-        'text': text,
+        'auth_key': get_deepl_api_key(),
+        'text': texts,
         'target_lang': target_language
     }
     
     try:
-        response = requests.post(DEEPL_URL, data=params, timeout=10)
+        response = get_http_client().post(DEEPL_URL, data=params)
         
         # Check if the request was successful
         response.raise_for_status()
@@ -38,185 +59,474 @@ def translate_text(text, target_language):
         # Try to parse the JSON response
         try:
             data = response.json()
-            if 'translations' in data and len(data['translations']) > 0:
-                return data['translations'][0]['text']
+            translations = data.get('translations', []) if isinstance(data, dict) else []
+            if len(translations) == len(texts) and len(translations) > 0:
+                return [item['text'] for item in translations], None
             else:
                 print(f"Unexpected API response format: {data}")
-                return f"[Translation Error: Unexpected API response format]"
+                return None, f"[Translation Error: Unexpected API response format]"
         except requests.exceptions.JSONDecodeError as e:
             print(f"JSON decode error: {e}")
             print(f"Response content: {response.text}")
-            return f"[Translation Error: Invalid response from API]"
+            return None, f"[Translation Error: Invalid response from API]"
             
     except requests.exceptions.RequestException as e:
         print(f"API request error: {e}")
-        return f"[Translation Error: Could not connect to translation service]"
+        return None, f"[Translation Error: Could not connect to translation service]"
+
+def _request_size(text):
+    """Approximate the number of bytes a text adds to a form-encoded request"""
+    return len(urlencode({'text': text})) + 1
 
-def capture_user_voice():
+def _chunk_texts(texts):
     """
-    Capture the user's voice and return the text.
-    Uses dynamic silence detection to determine when the user has finished speaking.
+    Split texts into chunks that respect DeepL's per-request text count and size limits.
+    Yields (chunk, oversized) pairs; oversized chunks hold a single text that can never fit.
+    """
+    # Leave room for the auth key and target language parameters
+    budget = DEEPL_MAX_REQUEST_BYTES - 256
+    chunk = []
+    chunk_size = 0
+    for text in texts:
+        size = _request_size(text)
+        if size > budget:
+            yield [text], True
+            continue
+        if chunk and (len(chunk) >= DEEPL_MAX_TEXTS_PER_REQUEST or chunk_size + size > budget):
+            yield chunk, False
+            chunk = []
+            chunk_size = 0
+        chunk.append(text)
+        chunk_size += size
+    if chunk:
+        yield chunk, False
+
+def translate_text(text, target_language):
+    """
+    Translate text to the target language using the DeepL API.
+    """
+    return translate_text_detailed(text, target_language).text
+
+def translate_text_detailed(text, target_language):
+    """
+    Translate text and report where the translation came from (see _translate_text_detailed).
+    Identical requests made while one is already in flight share its result
+    instead of calling DeepL again.
+    """
+    key = (normalize_source(text), target_language.upper())
+    return _translation_flights.do(key, _translate_text_detailed, text, target_language)
+
+def _translate_text_detailed(text, target_language):
+    """
+    Translate text and report where the translation came from.
+    Returns a TranslationResult whose origin is "cache", "deepl", "memory"
+    (a close stored match used without calling DeepL), "memory_fallback"
+    (a similar stored translation used because DeepL failed) or "error".
+    score is the similarity of the stored source sentence for memory results.
+    """
+    # Serve repeat translations from the persistent cache
+    cache = get_translation_cache()
+    cached = cache.get(text, target_language)
+    if cached is not None:
+        return TranslationResult(cached, "cache", 1.0)
+    
+    memory = get_translation_memory()
+    settings = get_settings(TranslationMemorySettings)
+    
+    # Optional fast path: a near-identical sentence we have translated before
+    if settings.fast_path_min_score is not None:
+        match = memory.lookup(text, target_language, float(settings.fast_path_min_score))
+        if match is not None:
+            return TranslationResult(match.translation, "memory", match.score)
+    
+    # Check if API key is set
+    if not get_deepl_api_key():
+        print("Error: DeepL API key is not configured.")
+        error = f"[Translation Error: API key not configured. Please set your DeepL API key.]"
+    else:
+        translations, error = _request_translations([text], target_language)
+        if not error:
+            cache.put(text, target_language, translations[0])
+            memory.add(text, target_language, translations[0])
+            return TranslationResult(translations[0], "deepl", 1.0)
+    
+    # Offline or failing: fall back to the most similar sentence we have seen
+    match = memory.lookup(text, target_language, settings.fallback_min_score)
+    if match is not None:
+        print(f"Using a similar stored translation ({match.score:.0%} match): {match.source}")
+        return TranslationResult(match.translation, "memory_fallback", match.score)
+    return TranslationResult(error, "error", 0.0)
+
+def translate_many(texts, target_language):
+    """
+    Translate a list of sentences using as few DeepL requests as possible.
+    Results are returned in input order. Items DeepL could not translate get the
+    translation of a similar stored sentence if there is one, and otherwise
+    their own "[Translation Error: ...]" string instead of a translation.
     """
-    recognizer = sr.Recognizer()
+    texts = list(texts)
+    results = [None] * len(texts)
+    cache = get_translation_cache()
+    memory = get_translation_memory()
+    fallback_min_score = get_settings(TranslationMemorySettings).fallback_min_score
     
-    # Configure parameters for better natural speech recognition
-    recognizer.pause_threshold = 2.0       # Time of silence needed to consider speech complete (2 seconds)
-    recognizer.phrase_threshold = 0.3      # Lower threshold for continuous speech recognition
-    recognizer.non_speaking_duration = 1.0 # Time without speech to be considered a pause (not end)
-    recognizer.dynamic_energy_threshold = True # Automatically adjust for ambient noise
+    # Group identical sentences so each is only sent once
+    pending = {}
+    for index, text in enumerate(texts):
+        if not text or not text.strip():
+            results[index] = ""
+            continue
+        cached = cache.get(text, target_language)
+        if cached is not None:
+            results[index] = cached
+            continue
+        pending.setdefault(text, []).append(index)
     
-    with sr.Microphone() as source:
-        print("Please say something...")
-        # Adjust for ambient noise with longer duration for better accuracy
-        recognizer.adjust_for_ambient_noise(source, duration=1.0)
-        print("Listening...")
+    # Without a key, cached sentences are still served and the rest use the memory
+    has_key = bool(get_deepl_api_key())
+    if pending and not has_key:
+        print("Error: DeepL API key is not configured.")
+    
+    for chunk, oversized in _chunk_texts(list(pending)):
+        if not has_key:
+            translations, error = None, f"[Translation Error: API key not configured. Please set your DeepL API key.]"
+        elif oversized:
+            translations, error = None, f"[Translation Error: Text too long for a single request]"
+        else:
+            translations, error = _request_translations(chunk, target_language)
         
-        try:
-            # Listen without a specific time limit
-            # The pause_threshold parameter (2.0) now controls when to finish listening
-            audio = recognizer.listen(
-                source,
-                timeout=None,  # No timeout for waiting to start speech
-                phrase_time_limit=None  # No hard limit on phrase length
-            )
-            print("Finished listening")
-        except sr.WaitTimeoutError:
-            print("No speech detected")
-            return None
+        for position, source in enumerate(chunk):
+            if error:
+                # Fall back to the most similar sentence we have seen, if any
+                match = memory.lookup(source, target_language, fallback_min_score)
+                value = match.translation if match is not None else error
+            else:
+                value = translations[position]
+                cache.put(source, target_language, value)
+                memory.add(source, target_language, value)
+            for index in pending[source]:
+                results[index] = value
+    
+    return results
 
+def capture_user_voice(language="EN", alternatives=False, timings=None):
+    """
+    Capture the user's voice and return the text.
+    Listens on the shared microphone session, which stays open and calibrated
+    between recordings, so listening starts as soon as this is called.
+    language is the DeepL code of the language the user is expected to speak.
+    With alternatives=True the full n-best list of Hypothesis tuples is returned instead.
+    If a timings dict is given, the time.perf_counter() values at which speech ended
+    ("speech_end"), listening stopped ("listened") and recognition finished
+    ("recognized") are stored in it.
+    """
+    import speech_recognition as sr
+    from utility.microphone_session import get_microphone_session
+    from utility.recognition_backends import get_recognition_service, recognition_language
+    
+    session = get_microphone_session()
+    
+    print("Listening...")
     try:
-        print("Recognizing...")
-        # Use a more robust recognition setting
-        user_text = recognizer.recognize_google(
-            audio, 
-            language="en-US",  # Explicitly set language for better accuracy
-            show_all=False     # Return best match only
+        # Listen without a specific time limit; the session's endpointer
+        # (voice activity by default, or the 2 s pause_threshold) decides when to stop
+        audio = session.listen(
+            timeout=None,  # No timeout for waiting to start speech
+            phrase_time_limit=None  # No hard limit on phrase length
         )
-        print(f"You said: {user_text}")
-        return user_text
-    except sr.UnknownValueError:
-        print("Sorry, I could not understand what you said.")
+        print("Finished listening")
+        if timings is not None:
+            timings["listened"] = time.perf_counter()
+            timings["speech_end"] = session.last_speech_end or timings["listened"]
+    except sr.WaitTimeoutError:
+        print("No speech detected")
         return None
-    except sr.RequestError as e:
-        print(f"Could not request results; {e}")
+    except (OSError, AttributeError) as e:
+        # The device went away; reopen and recalibrate on the next attempt
+        print(f"Microphone error: {e}")
+        session.close()
         return None
 
-def play_audio(text, language):
+    print("Recognizing...")
+    hypotheses, backend = get_recognition_service().recognize_alternatives(audio, recognition_language(language))
+    if timings is not None:
+        timings["recognized"] = time.perf_counter()
+    if not hypotheses:
+        print("Sorry, I could not understand what you said.")
+        return None
+    
+    print(f"You said: {hypotheses[0].transcript}")
+    if alternatives:
+        return hypotheses
+    return hypotheses[0].transcript
+
+# How play_audio hands speech to the player: "memory" streams an in-memory
+# buffer straight to pygame, "file" plays the cached MP3 from disk
+AUDIO_PLAYBACK_MODE = "memory"
+
+def synthesize_speech(text, language, slow=False):
+    """
+    Return the path of an MP3 with the spoken text, synthesizing it only
+    if the same text, language and voice options are not already cached.
+    """
+    cache = get_audio_cache()
+    key = cache.key_for(text, language, slow=slow)
+    
+    cached_path = cache.get(key)
+    if cached_path:
+        print("Using cached audio")
+        return cached_path
+    
+    def synthesize():
+        from gtts import gTTS
+        
+        print("Synthesizing audio...")
+        tts = gTTS(text=text, lang=language, slow=slow)
+        return cache.store(key, tts.write_to_fp)
+    
+    # Concurrent requests for the same clip share one synthesis
+    return _synthesis_flights.do(("file", key), synthesize)
+
+def synthesize_speech_bytes(text, language, slow=False):
+    """
+    Return the spoken text as MP3 bytes without creating any files.
+    Newly synthesized clips are only kept in the in-memory cache tier.
+    """
+    cache = get_audio_cache()
+    key = cache.key_for(text, language, slow=slow)
+    
+    data = cache.get_bytes(key)
+    if data is not None:
+        print("Using cached audio")
+        return key, data, False
+    
+    def synthesize():
+        from gtts import gTTS
+        
+        print("Synthesizing audio in memory...")
+        buffer = BytesIO()
+        gTTS(text=text, lang=language, slow=slow).write_to_fp(buffer)
+        data = buffer.getvalue()
+        cache.remember(key, data)
+        return data
+    
+    # Concurrent requests for the same clip (e.g. a prefetch and a play) share one synthesis
+    return key, _synthesis_flights.do(("bytes", key), synthesize), True
+
+def prefetch_speech(text, language, slow=False):
+    """Synthesize speech ahead of time so a later play_audio call hits the cache"""
+    key, data, synthesized = synthesize_speech_bytes(text, language, slow=slow)
+    if synthesized:
+        get_audio_cache().put(key, data)
+
+def play_audio_file(source):
+    """
+    Play audio from a file path or binary file object and block until it finishes.
+    Uses pygame as the primary audio player and playsound as a fallback for paths.
+    Returns True if playback was started.
+    """
+    try:
+        import pygame
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        
+        print("Loading audio with pygame...")
+        if isinstance(source, str):
+            pygame.mixer.music.load(source)
+        else:
+            pygame.mixer.music.load(source, "mp3")
+        pygame.mixer.music.play()
+        
+        print("Playing audio...")
+        # Wait for playback to finish with a timeout
+        start_time = time.time()
+        timeout = 30  # Maximum wait time in seconds
+        
+        while pygame.mixer.music.get_busy() and (time.time() - start_time < timeout):
+            pygame.time.Clock().tick(10)  # Limit the loop to 10 times per second
+        
+        # Make sure we stop playback if we're exiting the loop due to timeout
+        if pygame.mixer.music.get_busy():
+            pygame.mixer.music.stop()
+            print("Audio playback timed out")
+        else:
+            print("Audio playback completed")
+        
+        # Release the source so the cache can evict it later
+        pygame.mixer.music.unload()
+        return True
+        
+    except Exception as pygame_error:
+        print(f"Pygame error: {pygame_error}")
+        if not isinstance(source, str):
+            return False
+        # Fall back to playsound, blocking until the clip has played
+        try:
+            print("Falling back to playsound...")
+            import playsound
+            playsound.playsound(source, True)
+            return True
+        except Exception as playsound_error:
+            print(f"Playsound error: {playsound_error}")
+            print("All audio playback methods failed")
+            return False
+
+def play_audio(text, language, mode=None, superseded=None):
     """
     Convert the text into speech and play it.
-    Uses pygame as the primary audio player with proper resource management.
+    Replays of the same text come straight from the audio cache.
+    superseded is an optional callable checked once the audio is ready;
+    if it returns True the clip is not played (a newer request replaced it).
     """
-    import os
-    import tempfile
-    import time
+    mode = mode or AUDIO_PLAYBACK_MODE
     
     # Print debug info
     print(f"Playing audio in language: {language}")
     print(f"Text to speak: {text[:30]}{'...' if len(text) > 30 else ''}")
     
-    temp_filename = None
-    
-    try:
-        # Create a temporary file with a valid filename
-        temp_dir = tempfile.gettempdir()
-        temp_filename = os.path.join(temp_dir, f"speech_{int(time.time())}.mp3")
-        print(f"Creating temp file: {temp_filename}")
+    if mode == "memory":
+        try:
+            key, data, synthesized = synthesize_speech_bytes(text, language)
+        except Exception as e:
+            print(f"Error in play_audio: {e}")
+            return
         
-        # Generate the speech
-        tts = gTTS(text=text, lang=language)
-        tts.save(temp_filename)
+        if superseded is not None and superseded():
+            print("Skipping superseded audio")
+            if synthesized:
+                get_audio_cache().put(key, data)
+            return
         
-        # Wait for file to be ready
-        time.sleep(0.5)
-        print("Audio file created successfully")
+        played = play_audio_file(BytesIO(data))
         
-        # Use pygame as the primary audio player
+        # Persist new clips after playback so disk I/O stays off the hot path;
+        # playsound needs a real file, so fall back to the cached path if pygame failed
+        cache = get_audio_cache()
         try:
-            import pygame
-            if not pygame.mixer.get_init():
-                pygame.mixer.init()
-            
-            print("Loading audio with pygame...")
-            pygame.mixer.music.load(temp_filename)
-            pygame.mixer.music.play()
-            
-            print("Playing audio...")
-            # Wait for playback to finish with a timeout
-            start_time = time.time()
-            timeout = 30  # Maximum wait time in seconds
-            
-            while pygame.mixer.music.get_busy() and (time.time() - start_time < timeout):
-                pygame.time.Clock().tick(10)  # Limit the loop to 10 times per second
-            
-            # Make sure we stop playback if we're exiting the loop due to timeout
-            if pygame.mixer.music.get_busy():
-                pygame.mixer.music.stop()
-                print("Audio playback timed out")
-            else:
-                print("Audio playback completed")
-            
-        except Exception as pygame_error:
-            print(f"Pygame error: {pygame_error}")
-            # Fallback to playsound with non-blocking mode
-            try:
-                print("Falling back to playsound...")
-                playsound.playsound(temp_filename, False)  # Non-blocking
-                # Give it time to play
-                time.sleep(5)  # Adjust based on typical audio length
-            except Exception as playsound_error:
-                print(f"Playsound error: {playsound_error}")
-                print("All audio playback methods failed")
-            
+            if not played:
+                play_audio_file(cache.get(key) or cache.put(key, data))
+            elif synthesized:
+                cache.put(key, data)
+        except OSError as e:
+            print(f"Error caching audio: {e}")
+        return
+    
+    try:
+        path = synthesize_speech(text, language)
     except Exception as e:
         print(f"Error in play_audio: {e}")
-    finally:
-        # Clean up with a delay to ensure file is no longer in use
-        if temp_filename and os.path.exists(temp_filename):
+        return
+    
+    if superseded is not None and superseded():
+        print("Skipping superseded audio")
+        return
+    
+    play_audio_file(path)
+
+# Sentence chunks synthesized ahead of the one playing
+SPEECH_LOOKAHEAD = 2
+
+def _synthesize_chunk(text, language, mode):
+    # (key, audio source, synthesized); file mode returns the cached path as the source
+    if mode == "memory":
+        return synthesize_speech_bytes(text, language)
+    return None, synthesize_speech(text, language), False
+
+def speak_pipelined(text, language, mode=None, superseded=None, on_first_audio=None,
+                    lookahead=SPEECH_LOOKAHEAD):
+    """
+    Speak text sentence by sentence: the first chunk plays as soon as it is
+    synthesized while the following ones are synthesized on the tts pool.
+    superseded works as in play_audio and is checked before every chunk;
+    on_first_audio is called when the first chunk starts playing.
+    Blocks until playback ends and returns True if anything was played.
+    """
+    mode = mode or AUDIO_PLAYBACK_MODE
+    chunks = split_sentences(text)
+    if not chunks:
+        return False
+    print(f"Speaking {len(chunks)} chunk(s) in language: {language}")
+    
+    pending = []
+    next_chunk = 0
+    
+    def fill():
+        nonlocal next_chunk
+        while next_chunk < len(chunks) and len(pending) <= lookahead:
+            pending.append(submit_task("tts", _synthesize_chunk, chunks[next_chunk], language, mode,
+                                       priority=PRIORITY_HIGH))
+            next_chunk += 1
+    
+    cache = get_audio_cache()
+    played_any = False
+    to_persist = []
+    try:
+        fill()
+        while pending:
+            future = pending.pop(0)
             try:
-                print(f"Attempting to remove temp file: {temp_filename}")
-                # Wait a moment before deleting
-                time.sleep(2.0)
-                os.remove(temp_filename)
-                print("Temp file removed successfully")
+                key, source, synthesized = future.result()
             except Exception as e:
-                print(f"Error removing temporary file: {e}")
-                # Schedule removal for later in a separate thread
-                def delayed_remove():
-                    try:
-                        time.sleep(5)
-                        if os.path.exists(temp_filename):
-                            os.remove(temp_filename)
-                            print("Temp file removed with delay")
-                    except Exception as delayed_error:
-                        print(f"Failed to remove temp file with delay: {delayed_error}")
-                
-                threading.Thread(target=delayed_remove).start()
-
-def normalize_text(text):
+                print(f"Error synthesizing speech: {e}")
+                return played_any
+            # Keep synthesis running ahead while this chunk plays
+            fill()
+            if synthesized:
+                to_persist.append((key, source))
+            if superseded is not None and superseded():
+                print("Skipping superseded audio")
+                return played_any
+            
+            if not played_any and on_first_audio is not None:
+                on_first_audio()
+            played_any = True
+            if mode == "memory":
+                if not play_audio_file(BytesIO(source)):
+                    play_audio_file(cache.get(key) or cache.put(key, source))
+            else:
+                play_audio_file(source)
+        return played_any
+    finally:
+        for future in pending:
+            future.cancel()
+        # Persist new clips once playback is over so disk I/O stays off the hot path
+        for key, data in to_persist:
+            try:
+                cache.put(key, data)
+            except OSError as e:
+                print(f"Error caching audio: {e}")
+
+def normalize_text(text, language=None):
     """
-    Normalize text by removing accents and converting to lowercase
-    for better comparison.
+    Normalize text by removing accents, punctuation and case differences
+    for better comparison, following the rules of the given language code.
     """
-    if text is None:
-        return None
-    # Convert to lowercase and normalize accents
-    normalized = unicodedata.normalize('NFKD', text.lower())
-    # Remove accents
-    normalized = ''.join([c for c in normalized if not unicodedata.combining(c)])
-    return normalized
+    return normalize(text, language)
 
-def run_in_thread(callback=None):
+def run_in_thread(callback=None, pool="network", priority=PRIORITY_NORMAL):
+    """
+    Decorate a function so calling it runs it on one of the shared worker pools.
+    The call returns a Future; on success the optional callback receives the result.
+    """
     def decorator(func):
         def wrapper(*args, **kwargs):
-            if callback:
-                def thread_target():
-                    result = func(*args, **kwargs)
-                    callback(result)
-                threading.Thread(target=thread_target).start()
-                return None
-            else:
-                threading.Thread(target=partial(func, *args, **kwargs)).start()
-                return None
+            future = submit_task(pool, func, *args, priority=priority, **kwargs)
+            
+            def on_done(done):
+                if done.cancelled():
+                    return
+                error = done.exception()
+                if error is not None:
+                    print(f"Background task {func.__name__} failed: {error!r}")
+                    return
+                if callback:
+                    try:
+                        callback(done.result())
+                    except Exception as callback_error:
+                        print(f"Callback for {func.__name__} failed: {callback_error!r}")
+            
+            future.add_done_callback(on_done)
+            return future
         return wrapper
     return decorator
 
@@ -254,11 +564,11 @@ def main():
 
             # Now, capture the user's attempt to say the sentence in the target language
             print("\nPlease say the sentence.")
-            user_attempt = capture_user_voice()
+            user_attempt = capture_user_voice(target_language)
             
             # Normalize text for comparison
-            normalized_attempt = normalize_text(user_attempt)
-            normalized_translation = normalize_text(translated_sentence)
+            normalized_attempt = normalize_text(user_attempt, target_language)
+            normalized_translation = normalize_text(translated_sentence, target_language)
 
             # Check if the user said the sentence correctly with normalized comparison
             if user_attempt and normalized_attempt == normalized_translation:
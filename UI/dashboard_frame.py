@@ -1,10 +1,19 @@
+import datetime
 import customtkinter as ctk
+from utility.attempt_history import get_attempt_history
 
 class DashboardFrame:
     def __init__(self, parent, show_practice_callback, current_language):
         self.parent = parent
         self.show_practice = show_practice_callback
         self.current_language = current_language
+        self.language_codes = {
+            "Spanish": "ES", 
+            "French": "FR", 
+            "German": "DE", 
+            "Japanese": "JA", 
+            "Italian": "IT"
+        }
         
     def create_frame(self, container):
         # Header
@@ -36,9 +45,67 @@ class DashboardFrame:
         practice_button.pack(padx=20, pady=20)
         
         # Selected language info
-        language_info = ctk.CTkLabel(
+        self.language_info = ctk.CTkLabel(
             content_frame,
             text=f"Currently selected language: {self.current_language.get()}",
             font=ctk.CTkFont(size=14)
         )
-        language_info.pack(padx=20, pady=20)
\ No newline at end of file
+        self.language_info.pack(padx=20, pady=20)
+        
+        # Progress statistics for the selected language
+        stats_frame = ctk.CTkFrame(content_frame)
+        stats_frame.pack(padx=20, pady=20, fill="x")
+        stats_frame.grid_columnconfigure((0, 1), weight=1)
+        
+        stats_label = ctk.CTkLabel(
+            stats_frame, text="Your Progress",
+            font=ctk.CTkFont(size=16, weight="bold")
+        )
+        stats_label.grid(row=0, column=0, columnspan=2, padx=20, pady=(20, 10), sticky="w")
+        
+        self.summary_label = ctk.CTkLabel(stats_frame, text="", font=ctk.CTkFont(size=14), justify="left")
+        self.summary_label.grid(row=1, column=0, columnspan=2, padx=20, pady=(0, 10), sticky="w")
+        
+        self.activity_label = ctk.CTkLabel(stats_frame, text="", font=ctk.CTkFont(family="Courier", size=13), justify="left")
+        self.activity_label.grid(row=2, column=0, padx=20, pady=(0, 20), sticky="nw")
+        
+        self.weakest_label = ctk.CTkLabel(stats_frame, text="", font=ctk.CTkFont(size=13), justify="left")
+        self.weakest_label.grid(row=2, column=1, padx=20, pady=(0, 20), sticky="nw")
+        
+        self.refresh_stats()
+    
+    def refresh_language(self):
+        """Update the page in place for a newly selected language"""
+        self.language_info.configure(text=f"Currently selected language: {self.current_language.get()}")
+        self.refresh_stats()
+    
+    def refresh_stats(self):
+        """Fill in the progress section from the history rollups (constant-time lookups)"""
+        language = self.current_language.get()
+        stats = get_attempt_history().stats(self.language_codes.get(language, "ES"))
+        
+        if not stats["attempts"]:
+            self.summary_label.configure(text=f"No {language} practice recorded yet. Your progress will appear here.")
+            self.activity_label.configure(text="")
+            self.weakest_label.configure(text="")
+            return
+        
+        self.summary_label.configure(text=(
+            f"Accuracy: {stats['accuracy']:.0%} over {stats['attempts']} attempts "
+            f"({stats['perfect']} perfect)\n"
+            f"Streak: {stats['current_streak']} days (best {stats['longest_streak']})"
+        ))
+        
+        # Attempts per day as a small text bar chart
+        busiest = max(count for _, count in stats["attempts_per_day"]) or 1
+        lines = ["Attempts per day:"]
+        for day, count in stats["attempts_per_day"]:
+            weekday = datetime.date.fromisoformat(day).strftime("%a")
+            bar = "█" * round(20 * count / busiest)
+            lines.append(f"{weekday} {bar} {count}")
+        self.activity_label.configure(text="\n".join(lines))
+        
+        lines = ["Phrases to work on:"]
+        for phrase, avg_score, attempts in stats["weakest_phrases"]:
+            lines.append(f"{avg_score:.0%}  {phrase}  ({attempts}x)")
+        self.weakest_label.configure(text="\n".join(lines))
\ No newline at end of file
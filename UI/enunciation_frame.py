@@ -1,6 +1,14 @@
+import time
 import customtkinter as ctk
 from tkinter import messagebox
-from LearningTranslator import capture_user_voice, play_audio, normalize_text, run_in_thread
+from functools import partial
+from LearningTranslator import capture_user_voice, play_audio, prefetch_speech, normalize_text, run_in_thread
+from utility.audio_prefetch import AudioPrefetcher
+from utility.ui_dispatcher import ui_callback, call_in_ui_coalesced
+from utility.phrase_corpus import get_phrase_corpus
+from utility.attempt_history import get_attempt_history
+from utility.review_scheduler import get_review_scheduler, phrase_card_id, quality_from_score
+from utility.scoring import best_hypothesis, describe_operations
 
 class EnunciationFrame:
     def __init__(self, parent, current_language):
@@ -14,51 +22,14 @@ class EnunciationFrame:
             "Italian": "IT"
         }
         
-        # Common phrases for practice (starter set)
-        self.practice_phrases = {
-            "Spanish": [
-                "Buenos días, ¿cómo estás?",
-                "Me gustaría un café, por favor",
-                "¿Dónde está la estación de tren?",
-                "Muchas gracias por tu ayuda",
-                "¿Qué hora es?",
-                "La comida está muy rica"
-            ],
-            "French": [
-                "Bonjour, comment allez-vous?",
-                "Je voudrais un café, s'il vous plaît",
-                "Où est la gare?",
-                "Merci beaucoup pour votre aide",
-                "Quelle heure est-il?",
-                "La nourriture est très bonne"
-            ],
-            "German": [
-                "Guten Tag, wie geht es Ihnen?",
-                "Ich hätte gerne einen Kaffee, bitte",
-                "Wo ist der Bahnhof?",
-                "Vielen Dank für Ihre Hilfe",
-                "Wie spät ist es?",
-                "Das Essen ist sehr lecker"
-            ],
-            "Italian": [
-                "Buongiorno, come stai?",
-                "Vorrei un caffè, per favore",
-                "Dov'è la stazione ferroviaria?",
-                "Grazie mille per il tuo aiuto",
-                "Che ora è?",
-                "Il cibo è molto buono"
-            ],
-            "Japanese": [
-                "こんにちは、お元気ですか？",
-                "コーヒーをください",
-                "駅はどこですか？",
-                "ご協力ありがとうございます",
-                "今何時ですか？",
-                "食べ物はとても美味しいです"
-            ]
-        }
+        # Phrases come from the indexed corpus, one page at a time, with a position per language
+        self.phrase_cursors = {}
+        
+        # A phrase served by the review scheduler takes the place of the cursor's phrase
+        self.review_phrases = {}
         
-        self.current_phrase_index = 0
+        # Synthesizes the current and neighbouring phrases in the background
+        self.audio_prefetcher = AudioPrefetcher(prefetch_speech)
         
     def create_frame(self, container):
         # Header frame with title and status
@@ -68,12 +39,12 @@ class EnunciationFrame:
         header_frame.grid_columnconfigure(1, weight=1)
         
         # Title
-        header = ctk.CTkLabel(
+        self.header_label = ctk.CTkLabel(
             header_frame, text=f"Enunciation Practice - {self.current_language.get()}", 
             font=ctk.CTkFont(size=24, weight="bold"),
             anchor="w"
         )
-        header.grid(row=0, column=0, sticky="w")
+        self.header_label.grid(row=0, column=0, sticky="w")
         
         # Status label
         self.status_label = ctk.CTkLabel(
@@ -169,19 +140,70 @@ class EnunciationFrame:
             width=150
         )
         next_button.pack(side="right", padx=20)
+        
+        random_button = ctk.CTkButton(
+            nav_frame,
+            text="Random Phrase",
+            command=self.random_phrase,
+            width=150
+        )
+        random_button.pack(side="top")
+        
+        # Warm the audio cache for the phrases the user is most likely to hear next
+        self.prefetch_adjacent_phrases()
+    
+    def refresh_language(self):
+        """Update the page in place for a newly selected language; each language keeps its position"""
+        self.header_label.configure(text=f"Enunciation Practice - {self.current_language.get()}")
+        self.phrase_display.configure(text=self.get_current_phrase())
+        self.feedback_label.configure(text="")
+        self.prefetch_adjacent_phrases()
+    
+    def phrase_cursor(self):
+        """Get the corpus cursor for the selected language, opening the corpus on first use"""
+        language = self.current_language.get()
+        if language not in self.phrase_cursors:
+            lang_code = self.language_codes.get(language)
+            if lang_code is None:
+                return None
+            self.phrase_cursors[language] = get_phrase_corpus().cursor(lang_code)
+        return self.phrase_cursors[language]
+    
+    def current_phrase(self):
+        """Get the current corpus Phrase, or None if the language has no phrases"""
+        review_phrase = self.review_phrases.get(self.current_language.get())
+        if review_phrase is not None:
+            return review_phrase
+        cursor = self.phrase_cursor()
+        return cursor.current() if cursor else None
     
     def get_current_phrase(self):
         """Get the current phrase based on the selected language"""
-        language = self.current_language.get()
-        phrases = self.practice_phrases.get(language, [])
-        
-        if not phrases:
+        phrase = self.current_phrase()
+        if phrase is None:
             return "No phrases available for this language"
+        return phrase.text
+    
+    def prefetch_adjacent_phrases(self):
+        """Prefetch audio for the current phrase and its next/previous neighbours"""
+        cursor = self.phrase_cursor()
+        phrase = self.current_phrase()
+        if phrase is None:
+            self.audio_prefetcher.cancel()
+            return
         
-        if self.current_phrase_index >= len(phrases):
-            self.current_phrase_index = 0
-            
-        return phrases[self.current_phrase_index]
+        lang_code = self.language_codes.get(self.current_language.get(), "es").lower()
+        texts = [phrase.text, cursor.peek_next().text, cursor.peek_previous().text]
+        
+        # A due review is likely to come up next as well
+        due = get_review_scheduler().next_due(phrase.language, "phrase")
+        if due is not None:
+            texts.append(due.prompt)
+        self.audio_prefetcher.prefetch([(text, lang_code) for text in texts])
+    
+    def stop_prefetching(self):
+        """Cancel queued prefetches, e.g. when the user leaves this page"""
+        self.audio_prefetcher.cancel()
     
     def play_current_phrase(self):
         """Play the audio for the current phrase"""
@@ -190,8 +212,9 @@ class EnunciationFrame:
         
         self.show_status(f"Playing {self.current_language.get()} audio...")
         
-        @run_in_thread(lambda result: self.show_status(""))
+        @run_in_thread(lambda result: self.show_status(""), pool="audio")
         def threaded_play_audio():
+            # A prefetch already synthesizing this phrase is shared inside play_audio
             play_audio(phrase, lang_code)
             return True
         
@@ -201,86 +224,130 @@ class EnunciationFrame:
         """Record the user's pronunciation and check it"""
         self.feedback_label.configure(text="Listening...")
         
-        @run_in_thread(self.process_pronunciation)
+        lang_code = self.language_codes.get(self.current_language.get(), "ES")
+        phrase = self.current_phrase()
+        started_at = time.perf_counter()
+        
+        @run_in_thread(ui_callback(lambda result: self.process_pronunciation(result, phrase, started_at)), pool="mic")
         def threaded_capture_voice():
-            return capture_user_voice()
+            return capture_user_voice(lang_code, alternatives=True)
         
         threaded_capture_voice()
     
-    def process_pronunciation(self, user_audio):
-        """Process the user's pronunciation and provide feedback"""
-        if not user_audio:
+    def process_pronunciation(self, hypotheses, phrase=None, started_at=None):
+        """Process the user's pronunciation, provide feedback and record the attempt"""
+        # Score against the phrase shown when recording started
+        if phrase is None:
+            phrase = self.current_phrase()
+        if phrase is None:
+            return
+        latency_ms = (time.perf_counter() - started_at) * 1000 if started_at is not None else None
+        
+        if not hypotheses:
             self.feedback_label.configure(text="Could not detect speech. Please try again.")
+            self.record_attempt(phrase, None, 0.0, latency_ms)
             return
         
-        # Get the current phrase
-        current_phrase = self.get_current_phrase()
+        current_phrase = phrase.text
+        normalize = partial(normalize_text, language=phrase.language)
         
-        # Normalize both texts for comparison
-        normalized_user = normalize_text(user_audio)
-        normalized_phrase = normalize_text(current_phrase)
+        # An exact match against the phrase's stored normalized form needs no alignment
+        exact = next((h for h in hypotheses if normalize(h.transcript) == phrase.normalized), None)
+        if exact is not None:
+            self.feedback_label.configure(
+                text=f"Excellent pronunciation!\nYou said: {exact.transcript}"
+            )
+            self.record_attempt(phrase, exact.transcript, 1.0, latency_ms)
+            return
         
-        # Use exact matching like in practice_frame.py
-        if normalized_user == normalized_phrase:
+        # Score every recognition alternative and keep the one closest to the phrase
+        best, result = best_hypothesis(current_phrase, hypotheses, normalize)
+        user_audio = best.transcript
+        details = describe_operations(result.operations)
+        self.record_attempt(phrase, user_audio, result.score, latency_ms)
+        
+        if result.score >= 1.0:
             self.feedback_label.configure(
                 text=f"Excellent pronunciation!\nYou said: {user_audio}"
             )
+        elif result.score > 0.7:
+            self.feedback_label.configure(
+                text=f"Good attempt! ({result.score:.0%} match)\nYou said: {user_audio}\nCorrect: {current_phrase}\n{details}"
+            )
         else:
-            # If not exact match, still provide similarity score for feedback
-            similarity = self.calculate_similarity(normalized_user, normalized_phrase)
-            
-            if similarity > 0.7:
-                self.feedback_label.configure(
-                    text=f"Good attempt! ({similarity:.0%} match)\nYou said: {user_audio}\nCorrect: {current_phrase}"
-                )
-            else:
-                self.feedback_label.configure(
-                    text=f"Keep practicing!\nYou said: {user_audio}\nCorrect: {current_phrase}"
-                )
+            self.feedback_label.configure(
+                text=f"Keep practicing! ({result.score:.0%} match)\nYou said: {user_audio}\nCorrect: {current_phrase}\n{details}"
+            )
     
-    def calculate_similarity(self, text1, text2):
-        """Calculate a simple similarity score between two texts"""
-        if not text1 or not text2:
-            return 0.0
-            
-        # Convert to sets of words for comparison
-        words1 = set(text1.split())
-        words2 = set(text2.split())
-        
-        # Calculate Jaccard similarity
-        intersection = len(words1.intersection(words2))
-        union = len(words1.union(words2))
-        
-        if union == 0:
-            return 0.0
-            
-        return intersection / union
+    def record_attempt(self, phrase, transcript, score, latency_ms):
+        """Queue the attempt for the history database and grade the phrase's review card"""
+        get_attempt_history().record(
+            "enunciation", phrase.language, phrase.text, transcript, score,
+            latency_ms=latency_ms, phrase_id=phrase.id
+        )
+        # Nothing was heard, so the review card is left as it was
+        if transcript is not None:
+            get_review_scheduler().review(
+                phrase.language, phrase_card_id(phrase.id), quality_from_score(score), phrase.text
+            )
     
     def next_phrase(self):
-        """Go to the next practice phrase"""
-        language = self.current_language.get()
-        phrases = self.practice_phrases.get(language, [])
-        
-        if not phrases:
+        """Go to the next due review, or else the next new phrase in the corpus"""
+        cursor = self.phrase_cursor()
+        if cursor is None:
             return
+        
+        language = self.current_language.get()
+        review_phrase = self.next_review_phrase()
+        if review_phrase is not None:
+            self.review_phrases[language] = review_phrase
+        else:
+            # Leaving a review returns to where the cursor was
+            if self.review_phrases.pop(language, None) is None and cursor.next() is None:
+                return
             
-        self.current_phrase_index = (self.current_phrase_index + 1) % len(phrases)
         self.phrase_display.configure(text=self.get_current_phrase())
         self.feedback_label.configure(text="")
+        self.prefetch_adjacent_phrases()
     
     def previous_phrase(self):
         """Go to the previous practice phrase"""
-        language = self.current_language.get()
-        phrases = self.practice_phrases.get(language, [])
-        
-        if not phrases:
+        cursor = self.phrase_cursor()
+        if cursor is None:
+            return
+        if self.review_phrases.pop(self.current_language.get(), None) is None and cursor.previous() is None:
             return
             
-        self.current_phrase_index = (self.current_phrase_index - 1) % len(phrases)
         self.phrase_display.configure(text=self.get_current_phrase())
         self.feedback_label.configure(text="")
+        self.prefetch_adjacent_phrases()
+    
+    def random_phrase(self):
+        """Jump to a random practice phrase"""
+        cursor = self.phrase_cursor()
+        if cursor is None or cursor.random() is None:
+            return
+        self.review_phrases.pop(self.current_language.get(), None)
+            
+        self.phrase_display.configure(text=self.get_current_phrase())
+        self.feedback_label.configure(text="")
+        self.prefetch_adjacent_phrases()
+    
+    def next_review_phrase(self):
+        """Take the earliest due phrase card from the scheduler, if any"""
+        lang_code = self.language_codes.get(self.current_language.get())
+        scheduler = get_review_scheduler()
+        current = self.current_phrase()
+        # take_due defers each card it hands out, so this loop always ends
+        while True:
+            card = scheduler.take_due(lang_code, "phrase")
+            if card is None:
+                return None
+            phrase = get_phrase_corpus().get(int(card.card_id.split(":", 1)[1]))
+            # Skip cards whose phrase left the corpus or is already on screen
+            if phrase is not None and (current is None or phrase.id != current.id):
+                return phrase
     
     def show_status(self, message):
-        """Update the status label"""
-        self.status_label.configure(text=message)
-        self.parent.update_idletasks()
\ No newline at end of file
+        """Update the status label from any thread, merging rapid updates"""
+        call_in_ui_coalesced(("status", id(self)), self.status_label.configure, text=message)
\ No newline at end of file
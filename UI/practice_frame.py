@@ -1,6 +1,13 @@
+import time
 import customtkinter as ctk
 from tkinter import messagebox
-from LearningTranslator import capture_user_voice, translate_text, play_audio, normalize_text, run_in_thread
+from functools import partial
+from LearningTranslator import (capture_user_voice, translate_text, translate_text_detailed, play_audio,
+                                speak_pipelined, is_translation_error, normalize_text, run_in_thread)
+from utility.ui_dispatcher import ui_callback, call_in_ui_coalesced
+from utility.scoring import best_hypothesis, describe_operations
+from utility.attempt_history import get_attempt_history
+from utility.review_scheduler import get_review_scheduler, translation_card_id, quality_from_score
 
 class PracticeFrame:
     def __init__(self, parent, current_language):
@@ -13,6 +20,11 @@ class PracticeFrame:
             "Japanese": "JA", 
             "Italian": "IT"
         }
+        # Bumped by each new recording, translation or language change; results
+        # and audio belonging to an older generation are dropped
+        self.generation = 0
+        # Last sentence recorded or translated; re-translated when the language changes
+        self.last_sentence = None
         
     def create_frame(self, container):
         # Header frame to contain both title and status
@@ -22,12 +34,12 @@ class PracticeFrame:
         header_frame.grid_columnconfigure(1, weight=1)  # Right (status)
         
         # Header - now in the header_frame instead of directly in container
-        header = ctk.CTkLabel(
+        self.header_label = ctk.CTkLabel(
             header_frame, text=f"Translation Practice - {self.current_language.get()}", 
             font=ctk.CTkFont(size=24, weight="bold"),
             anchor="w"
         )
-        header.grid(row=0, column=0, sticky="w")
+        self.header_label.grid(row=0, column=0, sticky="w")
         
         # Status label - now in the header_frame
         self.status_label = ctk.CTkLabel(
@@ -68,11 +80,11 @@ class PracticeFrame:
         translation_frame = ctk.CTkFrame(content_frame)
         translation_frame.pack(padx=20, pady=20, fill="x")
         
-        translation_label = ctk.CTkLabel(
+        self.translation_label = ctk.CTkLabel(
             translation_frame, text=f"Translation ({self.current_language.get()}):", 
             font=ctk.CTkFont(size=16, weight="bold")
         )
-        translation_label.pack(padx=20, pady=(20, 10), anchor="w")
+        self.translation_label.pack(padx=20, pady=(20, 10), anchor="w")
         
         # Translation display area
         self.translation_text = ctk.CTkTextbox(translation_frame, height=80)
@@ -100,7 +112,17 @@ class PracticeFrame:
             practice_frame, text="Start Practice Session", 
             command=self.start_practice
         )
-        self.practice_button.pack(padx=20, pady=(10, 20))
+        self.practice_button.pack(padx=20, pady=(10, 10))
+        
+        # Practise a sentence the review scheduler says is due
+        review_button = ctk.CTkButton(
+            practice_frame, text="Review Due Sentence", 
+            command=self.review_due_sentence
+        )
+        review_button.pack(padx=20, pady=(0, 20))
+        
+        # Load the review deck in the background so the button answers at once
+        get_review_scheduler().preload(self.language_codes.get(self.current_language.get(), "ES"), "translation")
         
         # Remove the old status frame at the bottom
         # self.status_frame = ctk.CTkFrame(content_frame, height=30)
@@ -109,55 +131,122 @@ class PracticeFrame:
         # self.status_label = ctk.CTkLabel(self.status_frame, text="")
         # self.status_label.pack(side="left", padx=10)
     
+    def refresh_language(self):
+        """Update the page in place for a newly selected language, keeping the sentence"""
+        language = self.current_language.get()
+        self.header_label.configure(text=f"Translation Practice - {language}")
+        self.translation_label.configure(text=f"Translation ({language}):")
+        self.translation_text.delete("0.0", "end")
+        get_review_scheduler().preload(self.language_codes.get(language, "ES"), "translation")
+        
+        # Translate the last real sentence (not a placeholder message) into the new language
+        user_text = self.last_sentence
+        if user_text:
+            self.show_status("Translating...")
+            lang_code = self.language_codes.get(language, "ES")
+            generation = self.next_generation()
+            
+            @run_in_thread(ui_callback(partial(self.show_translation, generation=generation)), pool="network")
+            def threaded_translate():
+                return translate_text_detailed(user_text, lang_code)
+            
+            threaded_translate()
+    
+    def next_generation(self):
+        """Start a new request, superseding any still in flight"""
+        self.generation += 1
+        return self.generation
+    
+    def is_superseded(self, generation):
+        return generation is not None and generation != self.generation
+    
+    def show_translation(self, result, generation=None):
+        """Show a translation result without playing it"""
+        if self.is_superseded(generation):
+            return
+        self.translation_text.delete("0.0", "end")
+        self.translation_text.insert("0.0", result.text)
+        self.show_status("")
+        
+        # Say so when the translation is a stored match rather than a fresh one
+        language = self.current_language.get()
+        if result.origin == "memory_fallback":
+            label = f"Translation ({language}) - offline, similar saved sentence ({result.score:.0%} match):"
+        elif result.origin == "memory":
+            label = f"Translation ({language}) - saved translation ({result.score:.0%} match):"
+        else:
+            label = f"Translation ({language}):"
+        self.translation_label.configure(text=label)
+    
     def record_and_translate(self):
-        """Record voice input and automatically translate it"""
+        """
+        Record voice input, translate it and speak the translation.
+        Speech starts from the translation worker as soon as the text arrives,
+        without waiting for the UI, and the time from Record to first audio is reported.
+        """
         # Show a "Listening..." label
         self.show_status("Listening...")
+        generation = self.next_generation()
+        timings = {"record": time.perf_counter()}
         
         # Define callback functions
-        @run_in_thread(self.on_voice_capture_complete)
+        @run_in_thread(ui_callback(partial(self.on_voice_capture_complete, generation=generation, timings=timings)), pool="mic")
         def threaded_capture_voice():
-            return capture_user_voice()
+            return capture_user_voice(timings=timings)
         
         # Start the voice capture in a thread
         threaded_capture_voice()
     
-    def on_voice_capture_complete(self, user_text):
+    def on_voice_capture_complete(self, user_text, generation=None, timings=None):
         """Callback when voice capture completes"""
+        if self.is_superseded(generation):
+            return
+        
         # Update UI with speech recognition result
         if user_text:
+            self.last_sentence = user_text
             self.input_text.delete("0.0", "end")
             self.input_text.insert("0.0", user_text)
             
             # Update status
             self.show_status("Translating...")
+            lang_code = self.language_codes.get(self.current_language.get(), "ES")
             
-            # Start translation in another thread
-            @run_in_thread(self.on_translation_complete)
+            # Translate and start speaking in another thread; the UI shows the text meanwhile
+            @run_in_thread(ui_callback(partial(self.on_translation_complete, generation=generation, timings=timings)), pool="network")
             def threaded_translate():
-                lang_code = self.language_codes.get(self.current_language.get(), "ES")
-                return translate_text(user_text, lang_code)
+                result = translate_text_detailed(user_text, lang_code)
+                if timings is not None:
+                    timings["translated"] = time.perf_counter()
+                if not is_translation_error(result.text) and not self.is_superseded(generation):
+                    self.speak(result.text, lang_code.lower(), generation, timings)
+                return result
             
             # Start the translation thread
             threaded_translate()
         else:
+            self.last_sentence = None
             self.input_text.delete("0.0", "end")
             self.input_text.insert("0.0", "Could not recognize speech. Please try again.")
             self.show_status("")
     
-    def on_translation_complete(self, translated_text):
-        """Callback when translation completes"""
-        self.translation_text.delete("0.0", "end")
-        self.translation_text.insert("0.0", translated_text)
-        self.show_status("")
-        
-        # Play the translation in a thread
-        self.play_translation()
+    def on_translation_complete(self, result, generation=None, timings=None):
+        """Callback when translation completes; the audio is already on its way"""
+        # A newer recording or language change has replaced this request
+        if self.is_superseded(generation):
+            return
+        self.show_translation(result)
+        if not is_translation_error(result.text):
+            # Cached audio can start before this runs; keep its latency report on screen
+            report = timings.get("report") if timings else None
+            self.show_status(report or "Playing audio...")
     
     def translate_text(self):
         """Manual translation function (kept for direct text input)"""
         input_text = self.input_text.get("0.0", "end").strip()
         if input_text:
+            self.next_generation()
+            self.last_sentence = input_text
             lang_code = self.language_codes.get(self.current_language.get(), "ES")
             translated_text = translate_text(input_text, lang_code)
             
@@ -175,13 +264,42 @@ class PracticeFrame:
         translation = self.translation_text.get("0.0", "end").strip()
         if translation:
             self.show_status("Playing audio...")
-            
-            @run_in_thread(lambda result: self.show_status(""))
-            def threaded_play_audio():
-                lang_code = self.language_codes.get(self.current_language.get(), "es").lower()
-                play_audio(translation, lang_code)
-            
-            threaded_play_audio()
+            lang_code = self.language_codes.get(self.current_language.get(), "es").lower()
+            self.speak(translation, lang_code, self.generation)
+    
+    def speak(self, text, lang_code, generation, timings=None):
+        """
+        Speak text on the audio pool, sentence by sentence, unless a newer
+        request supersedes it. Safe to call from any thread.
+        """
+        def first_audio():
+            if timings is None:
+                return
+            timings["first_audio"] = time.perf_counter()
+            self.report_latency(timings)
+        
+        @run_in_thread(lambda result: self.show_status(""), pool="audio")
+        def threaded_play_audio():
+            # Skip the rest if something newer was requested while it was synthesized
+            speak_pipelined(text, lang_code, superseded=lambda: self.is_superseded(generation),
+                            on_first_audio=first_audio)
+        
+        threaded_play_audio()
+    
+    def report_latency(self, timings):
+        """Print how long each stage took from pressing Record to the first audible output"""
+        def ms(start, end):
+            if start in timings and end in timings:
+                return f"{(timings[end] - timings[start]) * 1000:.0f} ms"
+            return "n/a"
+        
+        # Listening includes the endpointer's trailing silence after the speech ended
+        print(f"Record to first audio: {ms('record', 'first_audio')} "
+              f"(speaking {ms('record', 'speech_end')}, end of speech detected after {ms('speech_end', 'listened')}, "
+              f"recognition {ms('listened', 'recognized')}, translation {ms('recognized', 'translated')}, "
+              f"first speech chunk {ms('translated', 'first_audio')})")
+        timings["report"] = f"Playing audio (first sound {ms('speech_end', 'first_audio')} after you stopped speaking)"
+        self.show_status(timings["report"])
     
     def start_practice(self):
         # Get the current text
@@ -233,7 +351,7 @@ class PracticeFrame:
         # Record attempt button
         record_button = ctk.CTkButton(
             attempt_frame, text="Record Your Attempt", 
-            command=lambda: self.record_practice_attempt(practice_window, translated_text)
+            command=lambda: self.record_practice_attempt(practice_window, translated_text, original_text)
         )
         record_button.pack(padx=20, pady=20)
         
@@ -250,7 +368,7 @@ class PracticeFrame:
         lang_code = self.language_codes.get(self.current_language.get(), "es").lower()
         self.show_status(f"Playing {self.current_language.get()} audio...")
         
-        @run_in_thread(lambda result: self.show_status(""))
+        @run_in_thread(lambda result: self.show_status(""), pool="audio")
         def threaded_play_audio():
             # Debug output in thread
             print(f"Starting audio playback for language: {lang_code}")
@@ -262,33 +380,79 @@ class PracticeFrame:
         # Start the audio playback in a separate thread
         threaded_play_audio()
     
-    def record_practice_attempt(self, window, target_text):
+    def record_practice_attempt(self, window, target_text, prompt_text=None):
         # Show status
         self.result_label.configure(text="Listening...")
         
-        @run_in_thread(lambda result: self.process_practice_attempt(result, target_text))
+        # The attempt is spoken in the language being practised
+        lang_code = self.language_codes.get(self.current_language.get(), "ES")
+        started_at = time.perf_counter()
+        
+        @run_in_thread(ui_callback(lambda result: self.process_practice_attempt(result, target_text, started_at, prompt_text)), pool="mic")
         def threaded_capture_voice():
-            return capture_user_voice()
+            return capture_user_voice(lang_code, alternatives=True)
         
         threaded_capture_voice()
     
-    def process_practice_attempt(self, user_attempt, target_text):
-        if not user_attempt:
+    def process_practice_attempt(self, hypotheses, target_text, started_at=None, prompt_text=None):
+        lang_code = self.language_codes.get(self.current_language.get(), "ES")
+        latency_ms = (time.perf_counter() - started_at) * 1000 if started_at is not None else None
+        history = get_attempt_history()
+        
+        if not hypotheses:
             self.result_label.configure(text="Could not recognize your speech. Please try again.")
+            # Nothing was heard, so the review card is left as it was
+            history.record("translation", lang_code, target_text, None, 0.0, latency_ms=latency_ms)
             return
         
-        # Normalize both texts for comparison
-        normalized_attempt = normalize_text(user_attempt)
-        normalized_target = normalize_text(target_text)
+        # Score every recognition alternative and keep the one closest to the translation
+        best, result = best_hypothesis(target_text, hypotheses, partial(normalize_text, language=lang_code))
+        user_attempt = best.transcript
+        
+        # Queued for the history database; written in the background
+        history.record("translation", lang_code, target_text, user_attempt, result.score, latency_ms=latency_ms)
+        self.review_sentence(lang_code, prompt_text, target_text, result.score)
         
         # Check if the attempt matches the translation
-        if normalized_attempt == normalized_target:
+        if result.score >= 1.0:
             self.result_label.configure(text="Great job! You said the sentence correctly!")
         else:
-            self.result_label.configure(text=f"Not quite right.\nYou said: {user_attempt}\nCorrect: {target_text}")
+            details = describe_operations(result.operations)
+            self.result_label.configure(
+                text=f"Not quite right ({result.score:.0%} match).\nYou said: {user_attempt}\nCorrect: {target_text}\n{details}"
+            )
+    
+    def review_sentence(self, lang_code, prompt_text, target_text, score):
+        """Grade the sentence's review card so the scheduler knows when to bring it back"""
+        prompt_text = prompt_text or target_text
+        get_review_scheduler().review(
+            lang_code, translation_card_id(prompt_text, target_text), quality_from_score(score),
+            prompt_text, target_text
+        )
+    
+    def review_due_sentence(self):
+        """Load the earliest due sentence from the review scheduler and start practising it"""
+        lang_code = self.language_codes.get(self.current_language.get(), "ES")
+        scheduler = get_review_scheduler()
+        if not scheduler.is_loaded(lang_code, "translation"):
+            scheduler.preload(lang_code, "translation")
+            messagebox.showinfo("Review", "The review schedule is still loading. Please try again in a moment.")
+            return
+        card = scheduler.take_due(lang_code, "translation")
+        if card is None:
+            messagebox.showinfo("Review", "No sentences are due for review right now.")
+            return
+        
+        self.input_text.delete("0.0", "end")
+        self.input_text.insert("0.0", card.prompt)
+        self.translation_text.delete("0.0", "end")
+        self.translation_text.insert("0.0", card.answer)
+        self.start_practice()
     
     def show_status(self, message):
-        """Show a status message in the header bar"""
+        """
+        Show a status message in the header bar.
+        Safe to call from any thread; rapid updates are merged into one redraw.
+        """
         if hasattr(self, 'status_label'):
-            self.status_label.configure(text=message)
-            self.parent.update_idletasks()  # Force update the UI
\ No newline at end of file
+            call_in_ui_coalesced(("status", id(self)), self.status_label.configure, text=message)
\ No newline at end of file
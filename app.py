@@ -3,6 +3,9 @@ from utility.config_manager import load_config, save_config
 from UI.dashboard_frame import DashboardFrame
 from UI.practice_frame import PracticeFrame
 from UI.enunciation_frame import EnunciationFrame  # Add this import
+from utility.ui_dispatcher import install_dispatcher
+from utility.task_executor import submit, PRIORITY_LOW
+from utility.startup_profiler import phase
 
 class LanguageLearningApp(ctk.CTk):
     def __init__(self):
@@ -17,6 +20,9 @@ class LanguageLearningApp(ctk.CTk):
         self.geometry("1100x700")
         self.minsize(800, 600)
         
+        # Widget updates from worker threads are funnelled through this dispatcher
+        self.ui_dispatcher = install_dispatcher(self)
+        
         # Create variables
         self.current_language = ctk.StringVar(value="Spanish")
         self.current_page = "dashboard"
@@ -31,16 +37,38 @@ class LanguageLearningApp(ctk.CTk):
         self.grid_columnconfigure(1, weight=1)
         self.grid_rowconfigure(0, weight=1)
         
-        self._create_sidebar()
+        with phase("build sidebar"):
+            self._create_sidebar()
         
         # Main content frame
         self.main_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.main_frame.grid(row=0, column=1, padx=20, pady=20, sticky="nsew")
         self.main_frame.grid_columnconfigure(0, weight=1)
-        self.main_frame.grid_rowconfigure(1, weight=1)
+        self.main_frame.grid_rowconfigure(0, weight=1)
+        
+        # Each page is built once, on first visit, into its own container and then
+        # shown or hidden, so navigating keeps its state (transcripts, translations)
+        self.page_containers = {}
+        self.stale_pages = set()
         
         # Show default page
-        self.show_dashboard()
+        with phase("build dashboard"):
+            self.show_dashboard()
+        
+        # Open and calibrate the microphone in the background once the window is up,
+        # so the first recording does not pay for it
+        self.after(1000, self.warm_up_microphone)
+    
+    def warm_up_microphone(self):
+        def open_microphone():
+            try:
+                # Importing speech_recognition here keeps it off the startup path
+                from utility.microphone_session import get_microphone_session
+                get_microphone_session().open()
+            except Exception as e:
+                print(f"Microphone warm-up failed: {e}")
+        
+        submit("mic", open_microphone, priority=PRIORITY_LOW)
     
     def _create_sidebar(self):
         # Create sidebar frame
@@ -109,27 +137,50 @@ class LanguageLearningApp(ctk.CTk):
         self.appearance_menu.grid(row=8, column=0, padx=20, pady=(10, 20), sticky="ew")
     
     def show_dashboard(self):
-        self.clear_main_frame()
-        self.current_page = "dashboard"
-        self.update_sidebar_buttons()
-        self.dashboard.create_frame(self.main_frame)
+        self.show_page("dashboard")
     
     def show_practice(self):
-        self.clear_main_frame()
-        self.current_page = "practice"
-        self.update_sidebar_buttons()
-        self.practice.create_frame(self.main_frame)
+        self.show_page("practice")
     
-    # Add this method for the new page
     def show_enunciation(self):
-        self.clear_main_frame()
-        self.current_page = "enunciation"
-        self.update_sidebar_buttons()
-        self.enunciation.create_frame(self.main_frame)
+        self.show_page("enunciation")
+    
+    def page_frames(self):
+        return {"dashboard": self.dashboard, "practice": self.practice, "enunciation": self.enunciation}
     
-    def clear_main_frame(self):
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
+    def show_page(self, page):
+        """Show a page, building it the first time and reusing it afterwards"""
+        frames = self.page_frames()
+        previous = self.current_page
+        
+        if previous != page and previous in self.page_containers:
+            self.page_containers[previous].grid_remove()
+            if previous == "enunciation":
+                # Stop background audio prefetching for a page that is no longer visible
+                self.enunciation.stop_prefetching()
+        
+        self.current_page = page
+        self.update_sidebar_buttons()
+        
+        container = self.page_containers.get(page)
+        if container is None:
+            container = ctk.CTkFrame(self.main_frame, fg_color="transparent")
+            container.grid_columnconfigure(0, weight=1)
+            container.grid_rowconfigure(1, weight=1)
+            frames[page].create_frame(container)
+            self.page_containers[page] = container
+            self.stale_pages.discard(page)
+        elif page in self.stale_pages:
+            # The language changed while this page was hidden
+            self.stale_pages.discard(page)
+            frames[page].refresh_language()
+        elif page == "dashboard":
+            self.dashboard.refresh_stats()
+        elif page == "enunciation":
+            self.enunciation.prefetch_adjacent_phrases()
+        
+        container.grid(row=0, column=0, sticky="nsew")
+        container.tkraise()
     
     def update_sidebar_buttons(self):
         buttons = [self.dashboard_button, self.practice_button, self.enunciation_button]
@@ -143,10 +194,15 @@ class LanguageLearningApp(ctk.CTk):
     
     def change_language(self, new_language):
         self.current_language.set(new_language)
-        if self.current_page == "practice":
-            self.show_practice()
-        elif self.current_page == "enunciation":
-            self.show_enunciation()
+        
+        # Update the visible page in place; hidden pages catch up when next shown
+        for page, frame in self.page_frames().items():
+            if page not in self.page_containers:
+                continue
+            if page == self.current_page:
+                frame.refresh_language()
+            else:
+                self.stale_pages.add(page)
     
     def change_appearance_mode(self, new_appearance_mode):
         ctk.set_appearance_mode(new_appearance_mode)
@@ -1,30 +1,64 @@
-import customtkinter as ctk
-from app import LanguageLearningApp
-from utility.config_manager import load_config
-import pygame  # Add this import
+import argparse
+import sys
+from utility.startup_profiler import enable_profiler, get_profiler, phase, default_budget_ms
 
 if __name__ == "__main__":
-    # Initialize pygame mixer at startup
-    try:
-        pygame.mixer.init()
-        print("Pygame mixer initialized successfully")
-    except Exception as e:
-        print(f"Warning: Could not initialize pygame mixer: {e}")
-    
-    # Set appearance mode from saved config
-    appearance_mode = load_config()
-    ctk.set_appearance_mode(appearance_mode)
-    
-    # Set default color theme
+    parser = argparse.ArgumentParser(description="Linguify - Modern Language Learning")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Report time spent per import and startup phase, up to the first paint")
+    parser.add_argument("--startup-budget-ms", type=float, default=default_budget_ms,
+                        help="Time-to-first-paint budget reported by --profile-startup")
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        enable_profiler(args.startup_budget_ms)
+
+    # Heavy subsystems (speech recognition, text-to-speech, audio, HTTP) are
+    # imported and initialized on first use, so only the UI loads here
+    with phase("import customtkinter"):
+        import customtkinter as ctk
+    with phase("import app"):
+        from app import LanguageLearningApp
+        from utility.task_executor import shutdown_executor
+        from utility.attempt_history import close_attempt_history
+        from utility.review_scheduler import close_review_scheduler
+        from utility.config_manager import flush_config
+
+    # Set default color theme (the appearance mode is applied by the app from saved config)
     ctk.set_default_color_theme("blue")
-    
+
     # Launch application
-    app = LanguageLearningApp()
+    with phase("create main window"):
+        app = LanguageLearningApp()
+    app.after_idle(get_profiler().first_paint)
     app.mainloop()
+
+    # Release the microphone first, if it was ever opened: this stops a recording
+    # in progress so the mic worker is not still listening when it is joined below
+    microphone_session = sys.modules.get("utility.microphone_session")
+    if microphone_session is not None:
+        microphone_session.close_microphone_session()
+
+    # Cancel queued background work and give running tasks a moment to finish
+    shutdown_executor(wait=True, cancel_futures=True, timeout=2.0)
+
+    # Close pooled translation service connections, if they were ever opened
+    http_client = sys.modules.get("utility.http_client")
+    if http_client is not None:
+        http_client.close_http_client()
+
+    # Write out any practice attempts and review grades still queued
+    close_attempt_history()
+    close_review_scheduler()
     
-    # Clean up pygame resources on exit
-    try:
-        pygame.mixer.quit()
-        pygame.quit()
-    except:
-        pass
\ No newline at end of file
+    # Write a pending settings change (e.g. appearance mode) before exiting
+    flush_config()
+
+    # Clean up pygame resources on exit, if audio was ever played
+    pygame = sys.modules.get("pygame")
+    if pygame is not None:
+        try:
+            pygame.mixer.quit()
+            pygame.quit()
+        except:
+            pass
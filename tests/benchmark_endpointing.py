@@ -0,0 +1,70 @@
+"""
+Endpoint latency of the two recording modes on the WAV fixtures.
+
+    python tests/benchmark_endpointing.py
+
+"vad" is the voice-activity endpointer MicrophoneSession uses by default;
+"pause_threshold" replays speech_recognition's Recognizer.listen rule (the
+utterance ends after pause_threshold seconds of buffers below the energy
+threshold) with the settings the app used before. Latency is the time from
+the end of speech to the moment listening stops.
+"""
+import math
+import os
+import sys
+import time
+import wave
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utility.vad import default_hangover_ms, endpoint_wav, frame_rms
+
+fixtures_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+fixtures = ["phrase.wav", "fricative_ending.wav"]
+energy_threshold = 300.0
+pause_threshold = 2.0  # Seconds, as configured in MicrophoneSession
+chunk = 1024  # speech_recognition's default buffer size
+
+
+def endpoint_pause_threshold(path):
+    """(speech_start_ms, endpoint_ms) under speech_recognition's pause_threshold rule"""
+    with wave.open(path, "rb") as wav:
+        sample_rate = wav.getframerate()
+        seconds_per_buffer = chunk / sample_rate
+        pause_buffer_count = int(math.ceil(pause_threshold / seconds_per_buffer))
+        elapsed = 0.0
+        start = None
+        pause_count = 0
+        while True:
+            buffer = wav.readframes(chunk)
+            if len(buffer) < chunk * 2:
+                return start, None
+            elapsed += seconds_per_buffer
+            loud = frame_rms(buffer) > energy_threshold
+            if start is None:
+                if loud:
+                    start = (elapsed - seconds_per_buffer) * 1000
+                continue
+            pause_count = 0 if loud else pause_count + 1
+            if pause_count > pause_buffer_count:
+                return start, elapsed * 1000
+
+
+def main():
+    print(f"{'fixture':24} {'speech end':>10} {'vad stop':>9} {'latency':>8} {'pause stop':>11} {'latency':>8} {'vad cpu':>8}")
+    for name in fixtures:
+        path = os.path.join(fixtures_dir, name)
+        started = time.perf_counter()
+        _, speech_end, vad_stop = endpoint_wav(path, hangover_ms=default_hangover_ms)
+        cpu_ms = (time.perf_counter() - started) * 1000
+        _, pause_stop = endpoint_pause_threshold(path)
+
+        def latency(stop):
+            return f"{stop - speech_end:6.0f}ms" if stop is not None and speech_end is not None else "     n/a"
+
+        print(f"{name:24} {speech_end or 0:8.0f}ms {vad_stop or 0:7.0f}ms {latency(vad_stop)} "
+              f"{pause_stop or 0:9.0f}ms {latency(pause_stop)} {cpu_ms:6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
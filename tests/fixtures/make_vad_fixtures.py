@@ -0,0 +1,59 @@
+"""
+Regenerate the WAV fixtures used by test_vad.py and benchmark_endpointing.py.
+The clips are synthesized (voiced harmonics, fricative noise, room noise) so
+the expected speech boundaries are known exactly; they are 8 kHz 16-bit mono.
+"""
+import math
+import os
+import random
+import wave
+from array import array
+
+sample_rate = 8000
+fixtures_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Where speech starts and ends in each clip, in milliseconds
+expected = {
+    "phrase.wav": (600, 2350),
+    "fricative_ending.wav": (500, 1550),
+    "noise_only.wav": (None, None),
+}
+
+
+def noise(rng, seconds, level=30.0):
+    return [rng.gauss(0, level) for _ in range(int(seconds * sample_rate))]
+
+
+def voiced(rng, seconds, pitch=140.0, level=3000.0, syllable=0.2):
+    samples = []
+    for i in range(int(seconds * sample_rate)):
+        t = i / sample_rate
+        envelope = 0.4 + 0.6 * math.sin(math.pi * t / syllable) ** 2
+        tone = sum(math.sin(2 * math.pi * pitch * harmonic * t) / harmonic for harmonic in (1, 2, 3, 4))
+        samples.append(level * envelope * tone / 2 + rng.gauss(0, 30.0))
+    return samples
+
+
+def fricative(rng, seconds, level=230.0):
+    # Quiet, noisy and full of zero crossings, like an "s"
+    return [rng.gauss(0, level) for _ in range(int(seconds * sample_rate))]
+
+
+def write(name, samples):
+    pcm = array("h", (max(-32768, min(32767, int(round(sample)))) for sample in samples))
+    with wave.open(os.path.join(fixtures_dir, name), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm.tobytes())
+
+
+def main():
+    rng = random.Random(1234)
+    write("phrase.wav", noise(rng, 0.6) + voiced(rng, 0.9) + noise(rng, 0.25) + voiced(rng, 0.6) + noise(rng, 2.4))
+    write("fricative_ending.wav", noise(rng, 0.5) + voiced(rng, 0.8) + fricative(rng, 0.25) + noise(rng, 2.4))
+    write("noise_only.wav", noise(rng, 2.0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+import json
+import socket
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import requests
+
+import LearningTranslator
+from utility.http_client import HttpClient
+
+
+class StandInDeepL:
+    """
+    Local stand-in for the DeepL translate endpoint.
+    Each request takes the next scripted reply: a status code, optional
+    headers and an optional delay; once the script is used up it translates
+    by upper-casing the texts.
+    """
+
+    def __init__(self):
+        self.script = []
+        self.requests = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v2/translate"
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self.thread.start()
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+                form = parse_qs(body)
+                stand_in.requests.append((time.monotonic(), form))
+                status, headers, delay = stand_in.script.pop(0) if stand_in.script else (200, {}, 0)
+                if delay:
+                    time.sleep(delay)
+                if status == 200:
+                    payload = json.dumps({"translations": [
+                        {"detected_source_language": "EN", "text": text.upper()} for text in form.get("text", [])
+                    ]}).encode()
+                else:
+                    payload = b'{"message": "stand-in error"}'
+                try:
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _unused_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class HttpClientRetryTest(unittest.TestCase):
+    def setUp(self):
+        self.deepl = StandInDeepL()
+        self.client = HttpClient(max_retries=3, backoff_base=0.01, backoff_cap=1.0,
+                                 connect_timeout=1.0, read_timeout=0.5)
+
+    def tearDown(self):
+        self.client.close()
+        self.deepl.close()
+
+    def post(self, texts=("hello",)):
+        return self.client.post(self.deepl.url, data={"auth_key": "test", "text": list(texts), "target_lang": "ES"})
+
+    def test_success_is_not_retried(self):
+        response = self.post(["hello", "world"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["text"] for item in response.json()["translations"]], ["HELLO", "WORLD"])
+        self.assertEqual(len(self.deepl.requests), 1)
+
+    def test_server_errors_are_retried_until_success(self):
+        self.deepl.script = [(503, {}, 0), (500, {}, 0)]
+        response = self.post()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.deepl.requests), 3)
+
+    def test_rate_limit_honours_retry_after(self):
+        self.deepl.script = [(429, {"Retry-After": "0.3"}, 0)]
+        response = self.post()
+        self.assertEqual(response.status_code, 200)
+        (first, _), (second, _) = self.deepl.requests
+        self.assertGreaterEqual(second - first, 0.3)
+
+    def test_retry_after_is_capped(self):
+        self.deepl.script = [(429, {"Retry-After": "120"}, 0)]
+        started = time.monotonic()
+        self.assertEqual(self.post().status_code, 200)
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_invalid_retry_after_falls_back_to_backoff(self):
+        for value in ("-5", "nan", "inf", "soon"):
+            with self.subTest(value):
+                self.deepl.requests.clear()
+                self.deepl.script = [(429, {"Retry-After": value}, 0)]
+                self.assertEqual(self.post().status_code, 200)
+                self.assertEqual(len(self.deepl.requests), 2)
+
+    def test_gives_up_after_max_retries(self):
+        self.deepl.script = [(502, {}, 0)] * 10
+        response = self.post()
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(len(self.deepl.requests), 4)
+
+    def test_client_errors_are_not_retried(self):
+        self.deepl.script = [(403, {}, 0)]
+        self.assertEqual(self.post().status_code, 403)
+        self.assertEqual(len(self.deepl.requests), 1)
+
+    def test_read_timeout_is_not_retried(self):
+        # DeepL may already have processed the request, so it must not be sent again
+        self.deepl.script = [(200, {}, 1.0)]
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            self.post()
+        self.assertEqual(len(self.deepl.requests), 1)
+
+    def test_connection_errors_are_retried(self):
+        url = f"http://127.0.0.1:{_unused_port()}/v2/translate"
+        attempts = []
+        session_post = self.client.session.post
+
+        def counting_post(*args, **kwargs):
+            attempts.append(args)
+            return session_post(*args, **kwargs)
+
+        self.client.session.post = counting_post
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.client.post(url, data={"text": "hello"})
+        self.assertEqual(len(attempts), 4)
+
+
+class TranslateManyTest(unittest.TestCase):
+    """translate_many end to end against the stand-in, without the app's cache or memory"""
+
+    class _NoCache:
+        def get(self, text, target_language):
+            return None
+
+        def put(self, text, target_language, translation):
+            pass
+
+    class _NoMemory:
+        def add(self, source, target_lang, translation):
+            pass
+
+        def lookup(self, text, target_lang, min_score=None):
+            return None
+
+    def setUp(self):
+        self.deepl = StandInDeepL()
+        self.client = HttpClient(backoff_base=0.01, backoff_cap=0.1)
+        patches = {
+            "DEEPL_URL": self.deepl.url,
+            "get_deepl_api_key": lambda: "test-key",
+            "get_translation_cache": lambda: self._NoCache(),
+            "get_translation_memory": lambda: self._NoMemory(),
+        }
+        self.saved = {name: getattr(LearningTranslator, name) for name in patches}
+        for name, value in patches.items():
+            setattr(LearningTranslator, name, value)
+        import utility.http_client
+        self.saved_client = utility.http_client._http_client
+        utility.http_client._http_client = self.client
+
+    def tearDown(self):
+        import utility.http_client
+        utility.http_client._http_client = self.saved_client
+        for name, value in self.saved.items():
+            setattr(LearningTranslator, name, value)
+        self.client.close()
+        self.deepl.close()
+
+    def test_batches_and_deduplicates(self):
+        results = LearningTranslator.translate_many(["hello", "world", "hello", ""], "ES")
+        self.assertEqual(results, ["HELLO", "WORLD", "HELLO", ""])
+        self.assertEqual(len(self.deepl.requests), 1)
+        self.assertEqual(self.deepl.requests[0][1]["text"], ["hello", "world"])
+
+    def test_recovers_from_rate_limit(self):
+        self.deepl.script = [(429, {"Retry-After": "0"}, 0)]
+        self.assertEqual(LearningTranslator.translate_many(["hello"], "ES"), ["HELLO"])
+        self.assertEqual(len(self.deepl.requests), 2)
+
+    def test_persistent_failure_returns_error_strings(self):
+        self.deepl.script = [(503, {}, 0)] * 10
+        results = LearningTranslator.translate_many(["hello"], "ES")
+        self.assertTrue(LearningTranslator.is_translation_error(results[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+import importlib.util
+import threading
+import time
+import unittest
+
+import LearningTranslator
+from utility.single_flight import SingleFlight
+
+
+class SingleFlightTest(unittest.TestCase):
+    def run_concurrently(self, flight, key, fn, callers=8):
+        results = []
+        errors = []
+        start = threading.Barrier(callers)
+
+        def call():
+            start.wait()
+            try:
+                results.append(flight.do(key, fn))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        return results, errors
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        calls = []
+
+        def work():
+            calls.append(1)
+            time.sleep(0.2)
+            return "hola"
+
+        results, errors = self.run_concurrently(flight, ("hello", "ES"), work)
+        self.assertEqual(results, ["hola"] * 8)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.stats(), {"calls": 1, "shared": 7, "in_flight": 0})
+
+    def test_every_waiter_gets_the_exception(self):
+        flight = SingleFlight()
+
+        def work():
+            time.sleep(0.2)
+            raise ValueError("service unavailable")
+
+        results, errors = self.run_concurrently(flight, "key", work)
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors), 8)
+        self.assertTrue(all(isinstance(error, ValueError) for error in errors))
+
+    def test_key_is_released_after_completion(self):
+        flight = SingleFlight()
+        calls = []
+        self.assertEqual(flight.do("key", lambda: calls.append(1) or len(calls)), 1)
+        self.assertEqual(flight.do("key", lambda: calls.append(1) or len(calls)), 2)
+        with self.assertRaises(KeyError):
+            flight.do("key", lambda: {}["missing"])
+        self.assertEqual(flight.do("key", lambda: "after error"), "after error")
+        self.assertEqual(flight.stats()["in_flight"], 0)
+
+    def test_different_keys_do_not_wait_for_each_other(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        blocked = threading.Thread(target=flight.do, args=("slow", release.wait, 5))
+        blocked.start()
+        time.sleep(0.05)
+        self.assertEqual(flight.do("fast", lambda: "done"), "done")
+        release.set()
+        blocked.join(5)
+
+
+class _FakeAudioCache:
+    def __init__(self):
+        self.stored = {}
+
+    def get(self, key):
+        return None
+
+    def put(self, key, data):
+        self.stored[key] = data
+        return key
+
+
+class SupersededPlaybackTest(unittest.TestCase):
+    """Audio for a request that has been replaced is synthesized but never played"""
+
+    def setUp(self):
+        self.played = []
+        self.cache = _FakeAudioCache()
+
+        def synthesize(text, language, slow=False):
+            time.sleep(0.01)
+            return f"{language}:{text}", text.encode(), True
+
+        def play(source):
+            self.played.append(source.read().decode())
+            return True
+
+        patches = {
+            "synthesize_speech_bytes": synthesize,
+            "play_audio_file": play,
+            "get_audio_cache": lambda: self.cache,
+        }
+        self.saved = {name: getattr(LearningTranslator, name) for name in patches}
+        for name, value in patches.items():
+            setattr(LearningTranslator, name, value)
+
+    def tearDown(self):
+        for name, value in self.saved.items():
+            setattr(LearningTranslator, name, value)
+
+    def test_play_audio_skips_superseded_clip(self):
+        LearningTranslator.play_audio("hola", "es", mode="memory", superseded=lambda: True)
+        self.assertEqual(self.played, [])
+        # The clip is still kept for a later replay
+        self.assertIn("es:hola", self.cache.stored)
+
+    def test_play_audio_plays_current_clip(self):
+        LearningTranslator.play_audio("hola", "es", mode="memory", superseded=lambda: False)
+        self.assertEqual(self.played, ["hola"])
+
+    def test_speak_pipelined_stops_when_superseded(self):
+        text = "Primera frase bastante larga. Segunda frase bastante larga. Tercera frase bastante larga."
+        chunks = LearningTranslator.split_sentences(text)
+        self.assertEqual(len(chunks), 3)
+
+        # A newer request arrives while the first chunk is playing
+        superseded = lambda: len(self.played) >= 1
+        first_audio = []
+        played_any = LearningTranslator.speak_pipelined(
+            text, "es", mode="memory", superseded=superseded, on_first_audio=lambda: first_audio.append(1)
+        )
+        self.assertTrue(played_any)
+        self.assertEqual(self.played, [chunks[0]])
+        self.assertEqual(first_audio, [1])
+
+    def test_speak_pipelined_plays_every_chunk_in_order(self):
+        text = "Primera frase bastante larga. Segunda frase bastante larga. Tercera frase bastante larga."
+        LearningTranslator.speak_pipelined(text, "es", mode="memory", superseded=lambda: False)
+        self.assertEqual(self.played, LearningTranslator.split_sentences(text))
+
+
+@unittest.skipUnless(importlib.util.find_spec("customtkinter"), "customtkinter is not installed")
+class PracticeFrameGenerationTest(unittest.TestCase):
+    """Results that arrive for an older recording are dropped"""
+
+    def make_frame(self):
+        from UI.practice_frame import PracticeFrame
+
+        frame = PracticeFrame.__new__(PracticeFrame)
+        frame.generation = 0
+        frame.shown = []
+        frame.show_translation = lambda result, generation=None: frame.shown.append(result)
+        frame.show_status = lambda message: None
+        return frame
+
+    def test_stale_translation_is_dropped(self):
+        frame = self.make_frame()
+        old = frame.next_generation()
+        new = frame.next_generation()
+        result = LearningTranslator.TranslationResult("hola", "deepl", 1.0)
+        frame.on_translation_complete(result, generation=old)
+        self.assertEqual(frame.shown, [])
+        frame.on_translation_complete(result, generation=new)
+        self.assertEqual(frame.shown, [result])
+
+
+if __name__ == "__main__":
+    unittest.main()
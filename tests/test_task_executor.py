@@ -0,0 +1,36 @@
+import threading
+import time
+import unittest
+
+from utility.task_executor import TaskExecutor
+
+
+class TaskExecutorShutdownTest(unittest.TestCase):
+    def test_timeout_bounds_the_whole_shutdown(self):
+        executor = TaskExecutor({"network": 3, "tts": 3})
+        release = threading.Event()
+        for pool in ("network", "tts"):
+            for _ in range(3):
+                executor.submit(pool, release.wait, 10)
+        time.sleep(0.1)
+
+        started = time.monotonic()
+        executor.shutdown(wait=True, timeout=0.5)
+        elapsed = time.monotonic() - started
+        release.set()
+        self.assertLess(elapsed, 1.0)
+
+    def test_queued_work_is_cancelled(self):
+        executor = TaskExecutor({"audio": 1})
+        release = threading.Event()
+        running = executor.submit("audio", release.wait, 10)
+        queued = executor.submit("audio", lambda: None)
+        time.sleep(0.05)
+        executor.shutdown(wait=False, cancel_futures=True)
+        self.assertTrue(queued.cancelled())
+        release.set()
+        self.assertTrue(running.result(timeout=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from utility.translation_cache import TranslationCache
+
+
+class TranslationCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "translations.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_uses_wal_journal(self):
+        cache = TranslationCache(self.path)
+        cache.put("hello", "ES", "hola")
+        self.assertEqual(cache._connect().execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        cache.close()
+
+    def test_hits_do_not_write(self):
+        cache = TranslationCache(self.path)
+        cache.put("hello", "ES", "hola")
+        connection = cache._connect()
+        changes = connection.total_changes
+        for _ in range(50):
+            self.assertEqual(cache.get("hello", "ES"), "hola")
+        self.assertEqual(connection.total_changes, changes)
+        self.assertEqual(cache.hits, 50)
+        cache.close()
+
+    def test_touches_are_written_in_batches(self):
+        cache = TranslationCache(self.path, touch_batch=3)
+        for word in ("one", "two", "three"):
+            cache.put(word, "ES", word.upper())
+        connection = cache._connect()
+        changes = connection.total_changes
+        for word in ("one", "two", "three"):
+            cache.get(word, "ES")
+        self.assertEqual(connection.total_changes, changes + 3)
+        self.assertEqual(cache._touched, {})
+        cache.close()
+
+    def test_eviction_sees_deferred_hits(self):
+        cache = TranslationCache(self.path, max_entries=2)
+        cache.put("old", "ES", "viejo")
+        time.sleep(0.01)
+        cache.put("newer", "ES", "nuevo")
+        time.sleep(0.01)
+        # Only held in memory until the next put
+        self.assertEqual(cache.get("old", "ES"), "viejo")
+        time.sleep(0.01)
+        cache.put("newest", "ES", "novísimo")
+        self.assertEqual(cache.get("old", "ES"), "viejo")
+        self.assertIsNone(cache.get("newer", "ES"))
+        cache.close()
+
+    def test_close_writes_pending_touches(self):
+        cache = TranslationCache(self.path)
+        cache.put("hello", "ES", "hola")
+        stored = cache._connect().execute("SELECT last_used FROM translations").fetchone()[0]
+        time.sleep(0.01)
+        cache.get("hello", "ES")
+        cache.close()
+        with sqlite3.connect(self.path) as connection:
+            touched = connection.execute("SELECT last_used FROM translations").fetchone()[0]
+        self.assertGreater(touched, stored)
+
+
+if __name__ == "__main__":
+    unittest.main()
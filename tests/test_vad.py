@@ -0,0 +1,151 @@
+import math
+import os
+import random
+import tempfile
+import unittest
+import wave
+from array import array
+
+from utility.vad import EnergyZcrVad, Endpointer, endpoint_wav, frame_rms, frame_zcr
+
+fixtures_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+sample_rate = 8000
+frame_samples = 240  # 30 ms at 8 kHz
+frame_tolerance_ms = 60  # Two frames
+
+
+def fixture(name):
+    return os.path.join(fixtures_dir, name)
+
+
+def pcm(samples):
+    return array("h", (max(-32768, min(32767, int(sample))) for sample in samples)).tobytes()
+
+
+def tone_frame(level=3000.0, pitch=140.0):
+    return pcm(level * math.sin(2 * math.pi * pitch * i / sample_rate) for i in range(frame_samples))
+
+
+def noise_frame(level, seed=0):
+    rng = random.Random(seed)
+    return pcm(rng.gauss(0, level) for _ in range(frame_samples))
+
+
+class ScriptedVad:
+    """Classifies frames from a list of booleans instead of looking at the audio"""
+
+    def __init__(self, decisions):
+        self.decisions = list(decisions)
+
+    def is_speech(self, frame):
+        return self.decisions.pop(0)
+
+
+class FrameFeatureTest(unittest.TestCase):
+    def test_rms_of_silence_and_tone(self):
+        self.assertEqual(frame_rms(pcm([0] * frame_samples)), 0.0)
+        self.assertAlmostEqual(frame_rms(tone_frame(1000.0)), 1000.0 / math.sqrt(2), delta=10)
+
+    def test_zcr_separates_voiced_from_fricative(self):
+        self.assertLess(frame_zcr(tone_frame()), 0.1)
+        self.assertGreater(frame_zcr(noise_frame(200.0)), 0.3)
+
+
+class EnergyZcrVadTest(unittest.TestCase):
+    def test_loud_voiced_frame_is_speech(self):
+        self.assertTrue(EnergyZcrVad(energy_threshold=300).is_speech(tone_frame()))
+
+    def test_room_noise_is_not_speech(self):
+        self.assertFalse(EnergyZcrVad(energy_threshold=300).is_speech(noise_frame(30.0)))
+
+    def test_quiet_fricative_is_speech(self):
+        # Below the energy threshold but full of zero crossings, like an "s"
+        frame = noise_frame(230.0)
+        self.assertLess(frame_rms(frame), 300)
+        self.assertTrue(EnergyZcrVad(energy_threshold=300).is_speech(frame))
+        self.assertFalse(EnergyZcrVad(energy_threshold=300, fricative_zcr=1.1).is_speech(frame))
+
+    def test_threshold_follows_the_noise_floor(self):
+        vad = EnergyZcrVad(energy_threshold=100, fricative_zcr=1.1)
+        for seed in range(50):
+            self.assertFalse(vad.is_speech(noise_frame(90.0, seed)))
+        self.assertGreater(vad.threshold(), 200)
+        # Would have been speech against the configured threshold alone
+        self.assertFalse(vad.is_speech(tone_frame(250.0)))
+
+
+class EndpointerTest(unittest.TestCase):
+    def run_script(self, decisions, **options):
+        endpointer = Endpointer(ScriptedVad(decisions), frame_ms=30, **options)
+        for index in range(len(decisions)):
+            if endpointer.process(bytes([index % 256]) * 2):
+                break
+        return endpointer
+
+    def test_short_blip_does_not_start_an_utterance(self):
+        endpointer = self.run_script([False] * 5 + [True, True] + [False] * 20, min_speech_ms=90)
+        self.assertFalse(endpointer.started)
+
+    def test_start_end_and_pre_roll(self):
+        decisions = [False] * 20 + [True] * 10 + [False] * 20
+        endpointer = self.run_script(decisions, hangover_ms=300, min_speech_ms=90, pre_roll_ms=150)
+        self.assertTrue(endpointer.ended)
+        self.assertEqual(endpointer.speech_start_ms, 600)
+        self.assertEqual(endpointer.speech_end_ms, 900)
+        self.assertEqual(endpointer.elapsed_ms, 1200)
+        # Pre-roll keeps the frames just before speech was confirmed
+        first_frame_index = endpointer.frames[0][0]
+        self.assertEqual(first_frame_index, 20 + 3 - 5)
+
+    def test_pause_shorter_than_hangover_keeps_listening(self):
+        decisions = [True] * 5 + [False] * 9 + [True] * 5 + [False] * 20
+        endpointer = self.run_script(decisions, hangover_ms=300, min_speech_ms=60)
+        self.assertEqual(endpointer.speech_end_ms, 19 * 30)
+
+    def test_process_after_end_is_a_no_op(self):
+        endpointer = self.run_script([True] * 4 + [False] * 10, hangover_ms=90, min_speech_ms=60)
+        frames = len(endpointer.frames)
+        self.assertTrue(endpointer.process(b"\0\0"))
+        self.assertEqual(len(endpointer.frames), frames)
+
+
+class EndpointWavTest(unittest.TestCase):
+    expected = {
+        "phrase.wav": (600, 2350),
+        "fricative_ending.wav": (500, 1550),
+    }
+
+    def test_fixtures_are_endpointed_near_the_speech_boundaries(self):
+        for name, (start, end) in self.expected.items():
+            with self.subTest(name):
+                speech_start, speech_end, endpoint = endpoint_wav(fixture(name), hangover_ms=400)
+                self.assertAlmostEqual(speech_start, start, delta=frame_tolerance_ms)
+                self.assertAlmostEqual(speech_end, end, delta=frame_tolerance_ms)
+                self.assertAlmostEqual(endpoint, speech_end + 400, delta=30)
+
+    def test_mid_phrase_pause_does_not_end_the_utterance(self):
+        # phrase.wav has a 250 ms pause between its two words
+        _, speech_end, _ = endpoint_wav(fixture("phrase.wav"), hangover_ms=400)
+        self.assertGreater(speech_end, 2000)
+
+    def test_fricative_ending_is_kept(self):
+        _, speech_end, _ = endpoint_wav(fixture("fricative_ending.wav"))
+        self.assertGreater(speech_end, 1450)
+
+    def test_noise_only_never_starts(self):
+        self.assertEqual(endpoint_wav(fixture("noise_only.wav")), (None, None, None))
+
+    def test_rejects_stereo_audio(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stereo.wav")
+            with wave.open(path, "wb") as wav:
+                wav.setnchannels(2)
+                wav.setsampwidth(2)
+                wav.setframerate(sample_rate)
+                wav.writeframes(b"\0" * 4 * frame_samples)
+            with self.assertRaises(ValueError):
+                endpoint_wav(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
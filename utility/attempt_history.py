@@ -0,0 +1,365 @@
+import datetime
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+# Default location of the attempt history and how the writer groups inserts
+history_file = os.path.join(os.path.dirname(__file__), "attempt_history.db")
+default_batch_size = 500
+default_flush_interval = 0.25  # Seconds the writer waits to fill a batch
+stats_version = 1  # Bumped when the rollup rules change, so they are rebuilt once
+
+Attempt = namedtuple("Attempt", "created_at mode language phrase_id phrase transcript score latency_ms")
+
+_stop = object()
+
+
+class AttemptHistory:
+    """
+    Practice attempts stored in SQLite (WAL mode).
+    record() only queues the attempt; a dedicated writer thread commits
+    queued attempts in batches, so callers never wait on disk I/O.
+    """
+
+    def __init__(self, path=history_file, batch_size=default_batch_size, flush_interval=default_flush_interval):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.failed = 0
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._writer = None
+        self._read_connection = None
+        self._read_lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(
+            "CREATE TABLE IF NOT EXISTS attempts ("
+            " id INTEGER PRIMARY KEY,"
+            " created_at REAL NOT NULL,"
+            " mode TEXT NOT NULL,"
+            " language TEXT NOT NULL,"
+            " phrase_id INTEGER,"
+            " phrase TEXT NOT NULL,"
+            " transcript TEXT,"
+            " score REAL NOT NULL,"
+            " latency_ms REAL);"
+            "CREATE INDEX IF NOT EXISTS idx_attempts_language ON attempts (language, created_at);"
+            "CREATE INDEX IF NOT EXISTS idx_attempts_phrase ON attempts (language, phrase);"
+            # Rollups kept up to date by the writer, so the dashboard never scans attempts
+            "CREATE TABLE IF NOT EXISTS daily_stats ("
+            " language TEXT NOT NULL,"
+            " day TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL,"
+            " score_sum REAL NOT NULL,"
+            " PRIMARY KEY (language, day));"
+            "CREATE TABLE IF NOT EXISTS phrase_stats ("
+            " language TEXT NOT NULL,"
+            " phrase TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL,"
+            " score_sum REAL NOT NULL,"
+            " avg_score REAL NOT NULL,"
+            " last_attempt REAL NOT NULL,"
+            " PRIMARY KEY (language, phrase));"
+            "CREATE INDEX IF NOT EXISTS idx_phrase_stats_score ON phrase_stats (language, avg_score);"
+            "CREATE TABLE IF NOT EXISTS language_stats ("
+            " language TEXT PRIMARY KEY,"
+            " attempts INTEGER NOT NULL,"
+            " score_sum REAL NOT NULL,"
+            " perfect INTEGER NOT NULL,"
+            " current_streak INTEGER NOT NULL,"
+            " longest_streak INTEGER NOT NULL,"
+            " last_day TEXT NOT NULL);"
+        )
+        connection.commit()
+        return connection
+
+    def _start_writer(self):
+        with self._lock:
+            if self._closed:
+                return False
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name="attempt-history-writer", daemon=True)
+                self._writer.start()
+            return True
+
+    def record(self, mode, language, phrase, transcript, score, latency_ms=None, phrase_id=None, created_at=None):
+        """Queue one attempt for writing; returns immediately"""
+        if not self._start_writer():
+            return
+        self._queue.put(Attempt(
+            created_at if created_at is not None else time.time(),
+            mode,
+            language.upper(),
+            phrase_id,
+            phrase,
+            transcript,
+            float(score),
+            latency_ms
+        ))
+
+    def _run(self):
+        connection = self._connect()
+        self._backfill_stats(connection)
+        running = True
+        while running:
+            batch = []
+            markers = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _stop:
+                    running = False
+                    break
+                if isinstance(item, threading.Event):
+                    # A flush() marker: write what we have before signalling
+                    markers.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    with connection:
+                        self._write_batch(connection, batch)
+                    self.written += len(batch)
+                except sqlite3.Error as e:
+                    self.failed += len(batch)
+                    print(f"Error writing attempt history: {e}")
+            for marker in markers:
+                marker.set()
+        connection.close()
+
+    def _write_batch(self, connection, batch):
+        # Runs inside the writer's transaction, so attempts and rollups never disagree
+        connection.executemany(
+            "INSERT INTO attempts (created_at, mode, language, phrase_id, phrase, transcript, score, latency_ms)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            batch
+        )
+        self._update_stats(connection, batch)
+
+    def _update_stats(self, connection, batch):
+        # Attempts where nothing was heard (mic errors, no speech) are kept in the
+        # history but say nothing about the learner, so they stay out of the rollups
+        batch = [attempt for attempt in batch if attempt.transcript is not None]
+        # Aggregate the batch first so each rollup row is touched once per transaction
+        days = {}
+        phrases = {}
+        for attempt in batch:
+            day = _day(attempt.created_at)
+            attempts, score_sum = days.get((attempt.language, day), (0, 0.0))
+            days[(attempt.language, day)] = (attempts + 1, score_sum + attempt.score)
+            attempts, score_sum, last = phrases.get((attempt.language, attempt.phrase), (0, 0.0, 0.0))
+            phrases[(attempt.language, attempt.phrase)] = (
+                attempts + 1, score_sum + attempt.score, max(last, attempt.created_at)
+            )
+
+        connection.executemany(
+            "INSERT INTO daily_stats (language, day, attempts, score_sum) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT (language, day) DO UPDATE SET"
+            " attempts = attempts + excluded.attempts, score_sum = score_sum + excluded.score_sum",
+            [(language, day, attempts, score_sum) for (language, day), (attempts, score_sum) in days.items()]
+        )
+        connection.executemany(
+            "INSERT INTO phrase_stats (language, phrase, attempts, score_sum, avg_score, last_attempt)"
+            " VALUES (?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (language, phrase) DO UPDATE SET"
+            " attempts = attempts + excluded.attempts,"
+            " score_sum = score_sum + excluded.score_sum,"
+            " avg_score = (score_sum + excluded.score_sum) / (attempts + excluded.attempts),"
+            " last_attempt = MAX(last_attempt, excluded.last_attempt)",
+            [
+                (language, phrase, attempts, score_sum, score_sum / attempts, last)
+                for (language, phrase), (attempts, score_sum, last) in phrases.items()
+            ]
+        )
+
+        totals = {}
+        for (language, day), (attempts, score_sum) in sorted(days.items()):
+            totals.setdefault(language, []).append((day, attempts, score_sum))
+        perfect = {}
+        for attempt in batch:
+            if attempt.score >= 1.0:
+                perfect[attempt.language] = perfect.get(attempt.language, 0) + 1
+
+        for language, language_days in totals.items():
+            row = connection.execute(
+                "SELECT attempts, score_sum, perfect, current_streak, longest_streak, last_day"
+                " FROM language_stats WHERE language = ?", (language,)
+            ).fetchone()
+            attempts, score_sum, perfect_count, current, longest, last_day = row or (0, 0.0, 0, 0, 0, "")
+            for day, day_attempts, day_score in language_days:
+                attempts += day_attempts
+                score_sum += day_score
+                current, last_day = _extend_streak(current, last_day, day)
+                longest = max(longest, current)
+            connection.execute(
+                "INSERT OR REPLACE INTO language_stats"
+                " (language, attempts, score_sum, perfect, current_streak, longest_streak, last_day)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (language, attempts, score_sum, perfect_count + perfect.get(language, 0), current, longest, last_day)
+            )
+
+    def _backfill_stats(self, connection):
+        # History written before the rollups existed, or under older rollup rules,
+        # is folded in once
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        has_stats = connection.execute("SELECT 1 FROM language_stats LIMIT 1").fetchone() is not None
+        if version >= stats_version and has_stats:
+            return
+        if connection.execute("SELECT 1 FROM attempts LIMIT 1").fetchone() is None:
+            connection.execute(f"PRAGMA user_version = {stats_version}")
+            return
+        print("Building practice statistics from existing history...")
+        with connection:
+            connection.execute("DELETE FROM daily_stats")
+            connection.execute("DELETE FROM phrase_stats")
+            connection.execute("DELETE FROM language_stats")
+            connection.execute(f"PRAGMA user_version = {stats_version}")
+            cursor = connection.execute(
+                "SELECT created_at, mode, language, phrase_id, phrase, transcript, score, latency_ms"
+                " FROM attempts ORDER BY created_at"
+            )
+            while True:
+                rows = cursor.fetchmany(self.batch_size)
+                if not rows:
+                    break
+                self._update_stats(connection, [Attempt(*row) for row in rows])
+
+    def stats(self, language, days=7, weakest=5, today=None):
+        """
+        Dashboard statistics for a language, read from the rollup tables with
+        primary-key and index lookups only, so the cost does not grow with history.
+        """
+        language = language.upper()
+        today = today or _day(time.time())
+        first_day = _day_offset(today, -(days - 1))
+        connection = self._reader()
+        with self._read_lock:
+            totals = connection.execute(
+                "SELECT attempts, score_sum, perfect, current_streak, longest_streak, last_day"
+                " FROM language_stats WHERE language = ?", (language,)
+            ).fetchone()
+            per_day = dict(connection.execute(
+                "SELECT day, attempts FROM daily_stats WHERE language = ? AND day >= ? AND day <= ?",
+                (language, first_day, today)
+            ).fetchall())
+            weakest_phrases = connection.execute(
+                "SELECT phrase, avg_score, attempts FROM phrase_stats"
+                " WHERE language = ? ORDER BY avg_score LIMIT ?",
+                (language, weakest)
+            ).fetchall()
+
+        attempts, score_sum, perfect, current, longest, last_day = totals or (0, 0.0, 0, 0, 0, "")
+        # A streak only counts if it reaches today or yesterday
+        if last_day not in (today, _day_offset(today, -1)):
+            current = 0
+        return {
+            "attempts": attempts,
+            "accuracy": score_sum / attempts if attempts else None,
+            "perfect": perfect,
+            "current_streak": current,
+            "longest_streak": longest,
+            "attempts_per_day": [
+                (_day_offset(first_day, offset), per_day.get(_day_offset(first_day, offset), 0))
+                for offset in range(days)
+            ],
+            "weakest_phrases": weakest_phrases
+        }
+
+    def _reader(self):
+        # One read connection shared by callers; WAL lets it read while the writer commits
+        with self._read_lock:
+            if self._read_connection is None:
+                self._read_connection = self._connect()
+            return self._read_connection
+
+    def flush(self, timeout=5.0):
+        """Wait until everything queued so far has been committed"""
+        if self._writer is None or not self._writer.is_alive():
+            return True
+        marker = threading.Event()
+        self._queue.put(marker)
+        return marker.wait(timeout)
+
+    def recent(self, limit=20, language=None):
+        """Most recent attempts, newest first (WAL lets this read alongside the writer)"""
+        sql = "SELECT created_at, mode, language, phrase_id, phrase, transcript, score, latency_ms FROM attempts"
+        params = []
+        if language:
+            sql += " WHERE language = ?"
+            params.append(language.upper())
+        sql += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        connection = self._reader()
+        with self._read_lock:
+            return [Attempt(*row) for row in connection.execute(sql, params)]
+
+    def close(self, timeout=5.0):
+        """Write out queued attempts and stop the writer thread"""
+        with self._lock:
+            self._closed = True
+            writer = self._writer
+        if writer is not None and writer.is_alive():
+            self._queue.put(_stop)
+            writer.join(timeout)
+        with self._read_lock:
+            if self._read_connection is not None:
+                self._read_connection.close()
+                self._read_connection = None
+
+
+def _day(timestamp):
+    return time.strftime("%Y-%m-%d", time.localtime(timestamp))
+
+
+def _day_offset(day, offset):
+    return (datetime.date.fromisoformat(day) + datetime.timedelta(days=offset)).isoformat()
+
+
+def _extend_streak(current, last_day, day):
+    """Streak of consecutive practice days after practising on day"""
+    if not last_day:
+        return 1, day
+    if day <= last_day:
+        return current, last_day  # Same day, or late-arriving older attempts
+    if day == _day_offset(last_day, 1):
+        return current + 1, day
+    return 1, day
+
+
+_attempt_history = None
+_attempt_history_lock = threading.Lock()
+
+
+def get_attempt_history():
+    """Return the shared attempt history, creating it on first use"""
+    global _attempt_history
+    with _attempt_history_lock:
+        if _attempt_history is None:
+            _attempt_history = AttemptHistory()
+        return _attempt_history
+
+
+def close_attempt_history(timeout=5.0):
+    global _attempt_history
+    with _attempt_history_lock:
+        history = _attempt_history
+        _attempt_history = None
+    if history is not None:
+        history.close(timeout)
@@ -0,0 +1,196 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from utility.config_manager import get_settings, CacheSettings
+
+# Default location and size cap for synthesized speech
+cache_dir = os.path.join(os.path.dirname(__file__), "audio_cache")
+default_max_bytes = 100 * 1024 * 1024
+default_memory_max_bytes = 8 * 1024 * 1024  # Recently played clips kept in RAM
+audio_extension = ".mp3"
+
+
+class AudioCache:
+    """Content-addressed disk cache of synthesized audio with LRU eviction"""
+
+    def __init__(self, directory=cache_dir, max_bytes=default_max_bytes,
+                 memory_max_bytes=default_memory_max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_max_bytes = memory_max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index = None  # key -> size in bytes, least recently used first
+        self._total_bytes = 0
+        self._memory = OrderedDict()  # key -> audio bytes, least recently used first
+        self._memory_bytes = 0
+
+    @staticmethod
+    def key_for(text, language, **options):
+        """Hash the text, language and voice options into a stable cache key"""
+        payload = json.dumps(
+            {"text": text, "language": language.lower(), "options": options},
+            sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key + audio_extension)
+
+    def _load_index(self):
+        # Rebuild the LRU order from file modification times on first use
+        if self._index is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(audio_extension):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, name[:-len(audio_extension)], stat.st_size))
+        entries.sort()
+        self._index = OrderedDict((key, size) for _, key, size in entries)
+        self._total_bytes = sum(self._index.values())
+
+    def get(self, key):
+        """Return the path of a cached clip, or None if it has not been synthesized yet"""
+        with self._lock:
+            self._load_index()
+            if key not in self._index:
+                self.misses += 1
+                return None
+            path = self.path_for(key)
+            try:
+                # Touch the file so the LRU order survives restarts
+                os.utime(path, None)
+            except OSError:
+                self._total_bytes -= self._index.pop(key)
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+            self.hits += 1
+            return path
+
+    def store(self, key, write_fp):
+        """
+        Atomically add a clip to the cache.
+        write_fp is called with a binary file object to write the audio into.
+        """
+        with self._lock:
+            self._load_index()
+        path = self.path_for(key)
+
+        # Write to a temporary file in the same directory, then rename over the target
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write_fp(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+        size = os.path.getsize(path)
+        with self._lock:
+            if key in self._index:
+                self._total_bytes -= self._index.pop(key)
+            self._index[key] = size
+            self._total_bytes += size
+            self._evict()
+        return path
+
+    def put(self, key, data):
+        """Add raw audio bytes to the cache and return the stored path"""
+        return self.store(key, lambda f: f.write(data))
+
+    def get_bytes(self, key):
+        """Return cached audio bytes from memory, falling back to the disk cache"""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return data
+        path = self.get(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            print(f"Error reading cached audio {key}: {e}")
+            return None
+        self.remember(key, data)
+        return data
+
+    def remember(self, key, data):
+        """Keep a clip in the in-memory tier without touching the disk"""
+        with self._lock:
+            if self.memory_max_bytes is None or len(data) > self.memory_max_bytes:
+                return
+            if key in self._memory:
+                self._memory_bytes -= len(self._memory.pop(key))
+            self._memory[key] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.memory_max_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def contains(self, key):
+        """Return True if the clip is cached in memory or on disk, without counting a hit"""
+        with self._lock:
+            if key in self._memory:
+                return True
+            self._load_index()
+            return key in self._index
+
+    def _evict(self):
+        # Drop least recently used clips, but never the one that was just stored
+        while self.max_bytes is not None and self._total_bytes > self.max_bytes and len(self._index) > 1:
+            key, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self.path_for(key))
+            except OSError as e:
+                print(f"Error removing cached audio {key}: {e}")
+
+    def stats(self):
+        with self._lock:
+            self._load_index()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._index),
+                "bytes": self._total_bytes,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes
+            }
+
+
+_audio_cache = None
+_audio_cache_lock = threading.Lock()
+
+
+def get_audio_cache():
+    """Return the shared audio cache, creating it on first use"""
+    global _audio_cache
+    with _audio_cache_lock:
+        if _audio_cache is None:
+            settings = get_settings(CacheSettings)
+            _audio_cache = AudioCache(
+                max_bytes=settings.audio_max_bytes,
+                memory_max_bytes=settings.audio_memory_max_bytes
+            )
+        return _audio_cache
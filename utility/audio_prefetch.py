@@ -0,0 +1,57 @@
+import threading
+from utility.task_executor import submit, PRIORITY_LOW
+
+
+class AudioPrefetcher:
+    """Synthesize upcoming phrases in the background so playback can start immediately"""
+
+    def __init__(self, synthesize, pool="tts", priority=PRIORITY_LOW):
+        # synthesize(text, language) must leave the clip in the audio cache
+        self.synthesize = synthesize
+        self.pool = pool
+        self.priority = priority
+        self._pending = {}  # (text, language) -> future
+        # Reentrant because cancelling a future runs its done callback immediately
+        self._lock = threading.RLock()
+
+    def prefetch(self, items):
+        """
+        Queue (text, language) pairs for synthesis in priority order.
+        Queued work for phrases that are no longer wanted is cancelled.
+        """
+        wanted = []
+        for item in items:
+            if item[0] and item not in wanted:
+                wanted.append(item)
+
+        with self._lock:
+            for item, future in list(self._pending.items()):
+                # Only work that has not started can be cancelled; running synthesis just finishes
+                if item not in wanted and future.cancel():
+                    self._pending.pop(item, None)
+
+            for item in wanted:
+                if item in self._pending:
+                    continue
+                future = submit(self.pool, self._run, item, priority=self.priority)
+                self._pending[item] = future
+                future.add_done_callback(lambda done, item=item: self._forget(item, done))
+
+    def _run(self, item):
+        text, language = item
+        try:
+            self.synthesize(text, language)
+        except Exception as e:
+            print(f"Audio prefetch failed for '{text[:30]}': {e}")
+
+    def _forget(self, item, future):
+        with self._lock:
+            if self._pending.get(item) is future:
+                self._pending.pop(item)
+
+    def cancel(self):
+        """Drop every prefetch that has not started yet"""
+        with self._lock:
+            for item, future in list(self._pending.items()):
+                if future.cancel():
+                    self._pending.pop(item, None)
@@ -1,48 +1,261 @@
 import os
 import json
+import atexit
+import tempfile
+import threading
+import typing
+from typing import Optional
+from dataclasses import dataclass, field, asdict, fields
 
 # Set default appearance mode and color theme
 default_appearance = "System"
 config_file = os.path.join(os.path.dirname(__file__), "config.json")
+default_flush_delay = 0.5  # Seconds of quiet before pending changes are written
+
+
+@dataclass
+class CacheSettings:
+    """Sizes of the translation and audio caches"""
+    translation_max_entries: int = 5000
+    translation_ttl_seconds: Optional[float] = None  # None means cached translations never expire
+    audio_max_bytes: int = 100 * 1024 * 1024
+    audio_memory_max_bytes: int = 8 * 1024 * 1024
+
+
+@dataclass
+class PoolSettings:
+    """Worker threads per pool and pooled HTTP connections"""
+    network: int = field(default=4, metadata={"min": 1})
+    tts: int = field(default=2, metadata={"min": 1})
+    audio: int = field(default=1, metadata={"min": 1})
+    mic: int = field(default=1, metadata={"min": 1})
+    http_connections: int = field(default=8, metadata={"min": 1})
+
+
+@dataclass
+class RecognitionSettings:
+    """Speech recognition backends, tried in order, and how recordings are ended"""
+    backends: list = field(default_factory=lambda: ["google", "sphinx"])
+    endpoint_mode: str = "vad"  # "vad" or "pause_threshold"
+    vad_engine: str = "auto"  # "auto", "energy" or "webrtc"
+    # Unpacked Vosk model directory per locale or DeepL code, e.g. {"ES": "~/models/vosk-model-small-es-0.42"}
+    vosk_model_paths: dict = field(default_factory=dict)
+
+
+@dataclass
+class TranslationMemorySettings:
+    """Size of the fuzzy translation memory and when its matches are used"""
+    max_segments: int = 2000000
+    fallback_min_score: float = 0.6  # Similar stored translations used when DeepL fails
+    fast_path_min_score: Optional[float] = None  # e.g. 0.95 answers close matches without calling DeepL
+
+
+# Config file section names for the typed settings
+settings_sections = {
+    CacheSettings: "cache",
+    PoolSettings: "pools",
+    RecognitionSettings: "recognition",
+    TranslationMemorySettings: "translation_memory"
+}
+
+
+def _field_type(item):
+    # Optional[float] -> float
+    kind = item.type
+    if typing.get_origin(kind) is typing.Union:
+        kind = next(arg for arg in typing.get_args(kind) if arg is not type(None))
+    return kind
+
+
+def _coerce(value, item):
+    # Values read from JSON are converted to the field's declared type
+    kind = _field_type(item)
+    if value is None:
+        if item.default is None:
+            return None
+        raise ValueError("value is required")
+    if kind in (list, dict):
+        if not isinstance(value, kind):
+            raise TypeError(f"expected a {kind.__name__}")
+        return value
+    if kind is bool:
+        return value if isinstance(value, bool) else str(value).lower() in ("1", "true", "yes", "on")
+    value = kind(value)
+    minimum = item.metadata.get("min")
+    if minimum is not None and value < minimum:
+        raise ValueError(f"must be at least {minimum}")
+    return value
+
+
+class ConfigStore:
+    """
+    In-memory copy of config.json, reloaded only when the file's mtime changes.
+    Changes are written atomically (temp file, fsync, rename), and rapid
+    changes are merged into one write after flush_delay seconds.
+    """
+
+    def __init__(self, path=config_file, flush_delay=default_flush_delay):
+        self.path = path
+        self.flush_delay = flush_delay
+        self._lock = threading.RLock()
+        self._data = None
+        self._mtime = None
+        self._dirty = False
+        self._timer = None
+
+    def _current(self):
+        # Pending changes win over the file until they have been flushed
+        if self._dirty:
+            return self._data
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if self._data is None or mtime != self._mtime:
+            self._data = self._read()
+            self._mtime = mtime
+        return self._data
+
+    def _read(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    config = json.load(f)
+                    if isinstance(config, dict):
+                        return config
+            except Exception as e:
+                print(f"Error loading config: {e}")
+        return {"appearance_mode": default_appearance, "deepl_api_key": ""}
+
+    def load(self):
+        """Return a copy of the complete configuration"""
+        with self._lock:
+            return json.loads(json.dumps(self._current()))
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._current().get(key, default)
+
+    def set(self, key, value):
+        self.update({key: value})
+
+    def update(self, values):
+        """Change some keys and schedule a write"""
+        with self._lock:
+            self._data = dict(self._current())
+            self._data.update(values)
+            self._dirty = True
+            self._schedule_flush()
+
+    def replace(self, config):
+        """Replace the whole configuration and schedule a write"""
+        with self._lock:
+            self._data = dict(config)
+            self._dirty = True
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        # Each change restarts the countdown, so a burst of changes is written once
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.flush_delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """Write pending changes now"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            try:
+                self._write(self._data)
+                self._dirty = False
+                self._mtime = os.stat(self.path).st_mtime_ns
+            except Exception as e:
+                print(f"Error saving config: {e}")
+
+    def _write(self, config):
+        # A crash mid-write leaves either the old file or the new one, never a truncated one
+        directory = os.path.dirname(self.path) or "."
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".config-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(config, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def settings(self, section_class):
+        """Typed settings for a section; missing or unknown keys fall back to the defaults"""
+        values = self.get(settings_sections[section_class], {}) or {}
+        kwargs = {}
+        for item in fields(section_class):
+            if item.name not in values:
+                continue
+            try:
+                kwargs[item.name] = _coerce(values[item.name], item)
+            except (TypeError, ValueError):
+                print(f"Ignoring invalid setting {settings_sections[section_class]}.{item.name}: {values[item.name]!r}")
+        return section_class(**kwargs)
+
+    def save_settings(self, settings):
+        self.set(settings_sections[type(settings)], asdict(settings))
+
+
+_config_store = None
+_config_store_lock = threading.Lock()
+
+
+def get_config_store():
+    """Return the shared config store, creating it on first use"""
+    global _config_store
+    with _config_store_lock:
+        if _config_store is None:
+            _config_store = ConfigStore()
+            # Pending changes are written even if the app exits before the debounce fires
+            atexit.register(_config_store.flush)
+        return _config_store
+
+
+def flush_config():
+    """Write any pending config changes now"""
+    if _config_store is not None:
+        _config_store.flush()
+
+
+def get_settings(section_class):
+    """Typed settings, e.g. get_settings(CacheSettings)"""
+    return get_config_store().settings(section_class)
 
 def load_config():
     """Load saved appearance mode if it exists"""
-    config = load_full_config()
-    return config.get("appearance_mode", default_appearance)
+    return get_config_store().get("appearance_mode", default_appearance)
 
 def save_config(appearance_mode):
     """Save appearance mode preference"""
-    config = load_full_config()
-    config["appearance_mode"] = appearance_mode
-    save_full_config(config)
+    get_config_store().set("appearance_mode", appearance_mode)
 
 def load_full_config():
     """Load the complete configuration file"""
-    if os.path.exists(config_file):
-        try:
-            with open(config_file, "r") as f:
-                config = json.load(f)
-                return config
-        except Exception as e:
-            print(f"Error loading config: {e}")
-    return {"appearance_mode": default_appearance, "deepl_api_key": ""}
+    return get_config_store().load()
 
 def save_full_config(config):
     """Save the complete configuration file"""
-    try:
-        with open(config_file, "w") as f:
-            json.dump(config, f)
-    except Exception as e:
-        print(f"Error saving config: {e}")
+    get_config_store().replace(config)
 
 def get_api_key():
     """Get the DeepL API key from config"""
-    config = load_full_config()
-    return config.get("deepl_api_key", "")
+    return get_config_store().get("deepl_api_key", "")
 
 def save_api_key(api_key):
     """Save DeepL API key to config"""
-    config = load_full_config()
-    config["deepl_api_key"] = api_key
-    save_full_config(config)
-
+    get_config_store().set("deepl_api_key", api_key)
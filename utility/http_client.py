@@ -0,0 +1,117 @@
+import math
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utility.config_manager import get_settings, PoolSettings
+
+# Connection pool and retry settings for calls to the translation service
+default_pool_size = 8
+default_max_retries = 3
+default_backoff_base = 0.5   # First retry waits about this many seconds
+default_backoff_cap = 8.0    # No single wait is longer than this
+default_connect_timeout = 3.05
+default_read_timeout = 10.0
+retry_status_codes = {429, 500, 502, 503, 504}
+
+
+class HttpClient:
+    """Shared keep-alive HTTP session with bounded, jittered retries"""
+
+    def __init__(self, pool_size=default_pool_size, max_retries=default_max_retries,
+                 backoff_base=default_backoff_base, backoff_cap=default_backoff_cap,
+                 connect_timeout=default_connect_timeout, read_timeout=default_read_timeout):
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = (connect_timeout, read_timeout)
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        # Build the session on first use so importing the module stays cheap
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def _backoff_delay(self, attempt, response=None):
+        """Full-jitter exponential backoff, honouring Retry-After when the server sends it"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    delay = float(retry_after)
+                except ValueError:
+                    delay = None
+                # Negative, nan or infinite values are ignored rather than passed to sleep
+                if delay is not None and math.isfinite(delay):
+                    return min(max(0.0, delay), self.backoff_cap)
+        ceiling = min(self.backoff_cap, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def post(self, url, **kwargs):
+        """
+        POST through the pooled session.
+        Retries failed connections and 429/5xx responses with backoff. Read
+        timeouts are not retried: the server may already have processed (and
+        billed) the request. The final response or exception is handed back
+        to the caller unchanged.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        while True:
+            try:
+                response = self.session.post(url, **kwargs)
+            except requests.exceptions.ConnectionError as e:
+                # Includes ConnectTimeout; ReadTimeout is not a ConnectionError
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+                print(f"Request failed ({e.__class__.__name__}), retrying in {delay:.2f}s")
+            else:
+                if response.status_code not in retry_status_codes or attempt >= self.max_retries:
+                    return response
+                delay = self._backoff_delay(attempt, response)
+                print(f"Server returned {response.status_code}, retrying in {delay:.2f}s")
+                response.close()
+
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Return the shared HTTP client, creating it on first use"""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = HttpClient(pool_size=get_settings(PoolSettings).http_connections)
+        return _http_client
+
+
+def close_http_client():
+    """Close pooled connections, e.g. when the application exits"""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
@@ -0,0 +1,236 @@
+import threading
+import time
+
+import speech_recognition as sr
+
+from utility.vad import Endpointer, create_vad, default_frame_ms, default_hangover_ms
+from utility.config_manager import get_settings, RecognitionSettings
+
+default_calibration_duration = 1.0     # Seconds of ambient noise sampled on first open
+default_recalibration_duration = 0.5   # Shorter refresh used while idle
+default_recalibrate_interval = 300.0   # Refresh the energy threshold this often when idle
+
+# "vad" ends an utterance after a short voice-activity hangover;
+# "pause_threshold" keeps speech_recognition's original 2 s silence rule
+default_endpoint_mode = "vad"
+default_vad_engine = "auto"  # "auto", "energy" or "webrtc"
+default_close_wait = 1.0  # Seconds close() waits for a recording to notice it was stopped
+
+
+class _StoppableStream:
+    """Wraps the microphone stream so a recording ends as soon as close() is called"""
+
+    def __init__(self, stream, stopped):
+        self._stream = stream
+        self._stopped = stopped
+
+    def read(self, size):
+        if self._stopped.is_set():
+            raise sr.WaitTimeoutError("listening stopped because the microphone was closed")
+        return self._stream.read(size)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class MicrophoneSession:
+    """Long-lived microphone stream with a cached ambient-noise calibration"""
+
+    def __init__(self, calibration_duration=default_calibration_duration,
+                 recalibration_duration=default_recalibration_duration,
+                 recalibrate_interval=default_recalibrate_interval,
+                 endpoint_mode=default_endpoint_mode, vad_engine=default_vad_engine,
+                 hangover_ms=default_hangover_ms, frame_ms=default_frame_ms):
+        self.calibration_duration = calibration_duration
+        self.recalibration_duration = recalibration_duration
+        self.recalibrate_interval = recalibrate_interval
+        self.endpoint_mode = endpoint_mode
+        self.vad_engine = vad_engine
+        self.hangover_ms = hangover_ms
+        self.frame_ms = frame_ms
+
+        self.recognizer = sr.Recognizer()
+        # Configure parameters for better natural speech recognition
+        self.recognizer.pause_threshold = 2.0       # Time of silence needed to consider speech complete (2 seconds)
+        self.recognizer.phrase_threshold = 0.3      # Lower threshold for continuous speech recognition
+        self.recognizer.non_speaking_duration = 1.0 # Time without speech to be considered a pause (not end)
+        self.recognizer.dynamic_energy_threshold = True # Keep adapting to ambient noise while listening
+
+        self.calibrated_at = None
+        # time.perf_counter() at which the last utterance's speech ended
+        self.last_speech_end = None
+        self._microphone = None
+        self._source = None
+        self._timer = None
+        self._lock = threading.RLock()  # Opening, calibrating and closing the stream
+        self._recording = threading.Lock()  # Held while frames are being read
+        self._stopped = threading.Event()
+
+    @property
+    def is_open(self):
+        return self._source is not None
+
+    def open(self):
+        """Open the microphone stream and calibrate it if that has not happened yet"""
+        with self._lock:
+            if self._source is None:
+                microphone = sr.Microphone()
+                self._source = microphone.__enter__()
+                self._microphone = microphone
+                print("Microphone opened")
+            if self.calibrated_at is None:
+                self.calibrate(self.calibration_duration)
+            self._schedule_recalibration()
+            return self._source
+
+    def calibrate(self, duration=None):
+        """Sample ambient noise now and update the recognizer's energy threshold"""
+        with self._lock:
+            if self._source is None:
+                return self.open()
+            duration = self.calibration_duration if duration is None else duration
+            print("Calibrating for ambient noise...")
+            self.recognizer.adjust_for_ambient_noise(self._source, duration=duration)
+            self.calibrated_at = time.time()
+            print(f"Energy threshold set to {self.recognizer.energy_threshold:.0f}")
+            return self._source
+
+    def _schedule_recalibration(self):
+        if self.recalibrate_interval is None or self._timer is not None:
+            return
+        self._timer = threading.Timer(self.recalibrate_interval, self._recalibrate_when_idle)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _recalibrate_when_idle(self):
+        self._timer = None
+        # Never interrupt a recording; just try again at the next interval
+        if self._recording.acquire(blocking=False):
+            try:
+                if self._source is not None:
+                    self.calibrate(self.recalibration_duration)
+            except Exception as e:
+                print(f"Background recalibration failed: {e}")
+            finally:
+                self._recording.release()
+        if self._source is not None:
+            self._schedule_recalibration()
+
+    def _discard_buffered_audio(self):
+        # Audio captured while idle belongs to the past; drop it before listening
+        try:
+            stream = self._source.stream.pyaudio_stream
+            available = stream.get_read_available()
+            if available > 0:
+                stream.read(available, exception_on_overflow=False)
+        except Exception:
+            pass
+
+    def listen(self, timeout=None, phrase_time_limit=None):
+        """
+        Listen for one utterance on the open stream and return the AudioData.
+        Raises sr.WaitTimeoutError if close() is called while listening.
+        """
+        with self._recording:
+            # The stream lock is only held to open and calibrate, so close()
+            # never has to wait for the user to start speaking
+            self._stopped.clear()
+            source = self.open()
+            self._discard_buffered_audio()
+            stream = source.stream
+            source.stream = _StoppableStream(stream, self._stopped)
+            try:
+                if self.endpoint_mode == "vad":
+                    return self._listen_vad(source, timeout, phrase_time_limit)
+                audio = self.recognizer.listen(
+                    source,
+                    timeout=timeout,
+                    phrase_time_limit=phrase_time_limit
+                )
+                # Listening stops pause_threshold seconds after the speech
+                self.last_speech_end = time.perf_counter() - self.recognizer.pause_threshold
+                return audio
+            finally:
+                source.stream = stream
+
+    def _listen_vad(self, source, timeout=None, phrase_time_limit=None):
+        """Read raw frames until the voice-activity endpointer detects the end of speech"""
+        frame_bytes = int(source.SAMPLE_RATE * self.frame_ms / 1000) * source.SAMPLE_WIDTH
+        vad = create_vad(source.SAMPLE_RATE, self.recognizer.energy_threshold, self.vad_engine)
+        endpointer = Endpointer(vad, frame_ms=self.frame_ms, hangover_ms=self.hangover_ms)
+
+        pending = b""
+        while True:
+            buffer = source.stream.read(source.CHUNK)
+            if not buffer:
+                break
+            pending += buffer
+            while len(pending) >= frame_bytes:
+                frame, pending = pending[:frame_bytes], pending[frame_bytes:]
+                if endpointer.process(frame):
+                    # Speech ended one hangover before the endpointer fired
+                    trailing_ms = endpointer.elapsed_ms - endpointer.speech_end_ms
+                    self.last_speech_end = time.perf_counter() - trailing_ms / 1000
+                    return sr.AudioData(endpointer.audio(), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+
+            elapsed = endpointer.elapsed_ms / 1000
+            if not endpointer.started and timeout and elapsed > timeout:
+                raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+            if endpointer.started and phrase_time_limit and \
+                    elapsed - endpointer.speech_start_ms / 1000 > phrase_time_limit:
+                break
+
+        self.last_speech_end = time.perf_counter()
+        return sr.AudioData(endpointer.audio(), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+
+    def close(self, wait=default_close_wait):
+        """Stop any recording in progress and release the microphone"""
+        self._stopped.set()
+        # A recording notices the stop after its current chunk; don't wait longer than that
+        recording = self._recording.acquire(timeout=wait)
+        try:
+            self._close_stream()
+        finally:
+            if recording:
+                self._recording.release()
+
+    def _close_stream(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._microphone is not None:
+                try:
+                    self._microphone.__exit__(None, None, None)
+                except Exception as e:
+                    print(f"Error closing microphone: {e}")
+            self._microphone = None
+            self._source = None
+            self.calibrated_at = None
+
+
+_microphone_session = None
+_microphone_session_lock = threading.Lock()
+
+
+def get_microphone_session():
+    """Return the shared microphone session, creating it on first use"""
+    global _microphone_session
+    with _microphone_session_lock:
+        if _microphone_session is None:
+            settings = get_settings(RecognitionSettings)
+            _microphone_session = MicrophoneSession(
+                endpoint_mode=settings.endpoint_mode,
+                vad_engine=settings.vad_engine
+            )
+        return _microphone_session
+
+
+def close_microphone_session():
+    """Release the microphone, e.g. when the application exits"""
+    global _microphone_session
+    with _microphone_session_lock:
+        session = _microphone_session
+        _microphone_session = None
+    if session is not None:
+        session.close()
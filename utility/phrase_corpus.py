@@ -0,0 +1,326 @@
+import argparse
+import csv
+import os
+import random
+import sqlite3
+import threading
+from collections import namedtuple
+
+from utility.text_normalization import normalize
+
+# Default location of the phrase corpus and how many phrases are loaded at a time
+corpus_file = os.path.join(os.path.dirname(__file__), "phrases.db")
+default_page_size = 200
+default_import_batch_size = 5000
+default_category = "general"
+default_difficulty = 1
+
+Phrase = namedtuple("Phrase", "id language category difficulty text normalized")
+
+_columns = "id, language, category, difficulty, text, normalized"
+
+
+class PhraseCorpus:
+    """SQLite phrase store indexed by (language, category, difficulty) with keyset paging"""
+
+    def __init__(self, path=corpus_file, page_size=default_page_size):
+        self.path = path
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.executescript(
+                "CREATE TABLE IF NOT EXISTS phrases ("
+                " id INTEGER PRIMARY KEY,"
+                " language TEXT NOT NULL,"
+                " category TEXT NOT NULL,"
+                " difficulty INTEGER NOT NULL,"
+                " text TEXT NOT NULL,"
+                " normalized TEXT NOT NULL,"
+                " UNIQUE (language, text));"
+                "CREATE INDEX IF NOT EXISTS idx_phrases_language ON phrases (language, id);"
+                "CREATE INDEX IF NOT EXISTS idx_phrases_filter ON phrases (language, category, difficulty, id);"
+                "CREATE INDEX IF NOT EXISTS idx_phrases_difficulty ON phrases (language, difficulty, id);"
+            )
+            self._connection.commit()
+        return self._connection
+
+    @staticmethod
+    def _where(language, category=None, difficulty=None):
+        clause = "language = ?"
+        params = [language.upper()]
+        if category is not None:
+            clause += " AND category = ?"
+            params.append(category)
+        if difficulty is not None:
+            clause += " AND difficulty = ?"
+            params.append(difficulty)
+        return clause, params
+
+    def _query(self, sql, params):
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+        return [Phrase(*row) for row in rows]
+
+    def count(self, language, category=None, difficulty=None):
+        clause, params = self._where(language, category, difficulty)
+        with self._lock:
+            return self._connect().execute(f"SELECT COUNT(*) FROM phrases WHERE {clause}", params).fetchone()[0]
+
+    def get(self, phrase_id):
+        rows = self._query(f"SELECT {_columns} FROM phrases WHERE id = ?", [phrase_id])
+        return rows[0] if rows else None
+
+    def page(self, language, after_id=0, limit=None, category=None, difficulty=None):
+        """Phrases with id greater than after_id, in id order"""
+        clause, params = self._where(language, category, difficulty)
+        return self._query(
+            f"SELECT {_columns} FROM phrases WHERE {clause} AND id > ? ORDER BY id LIMIT ?",
+            params + [after_id, limit or self.page_size]
+        )
+
+    def page_before(self, language, before_id=None, limit=None, category=None, difficulty=None):
+        """Phrases with id less than before_id (or the last ones), in id order"""
+        clause, params = self._where(language, category, difficulty)
+        if before_id is not None:
+            clause += " AND id < ?"
+            params.append(before_id)
+        rows = self._query(
+            f"SELECT {_columns} FROM phrases WHERE {clause} ORDER BY id DESC LIMIT ?",
+            params + [limit or self.page_size]
+        )
+        rows.reverse()
+        return rows
+
+    def random_phrase(self, language, category=None, difficulty=None):
+        """Pick a phrase at random using two index lookups instead of a table scan"""
+        clause, params = self._where(language, category, difficulty)
+        with self._lock:
+            low, high = self._connect().execute(
+                f"SELECT MIN(id), MAX(id) FROM phrases WHERE {clause}", params
+            ).fetchone()
+        if low is None:
+            return None
+        rows = self._query(
+            f"SELECT {_columns} FROM phrases WHERE {clause} AND id >= ? ORDER BY id LIMIT 1",
+            params + [random.randint(low, high)]
+        )
+        return rows[0] if rows else None
+
+    def add_phrases(self, rows):
+        """
+        Insert (language, text, category, difficulty) rows, skipping duplicates.
+        Normalized forms are computed here, once, at import time.
+        """
+        records = []
+        for language, text, category, difficulty in rows:
+            text = (text or "").strip()
+            if not text or not language:
+                continue
+            language = language.strip().upper()
+            records.append((
+                language,
+                (category or default_category).strip(),
+                int(difficulty or default_difficulty),
+                text,
+                normalize(text, language)
+            ))
+        if not records:
+            return 0
+        with self._lock:
+            connection = self._connect()
+            before = connection.total_changes
+            connection.executemany(
+                "INSERT OR IGNORE INTO phrases (language, category, difficulty, text, normalized)"
+                " VALUES (?, ?, ?, ?, ?)",
+                records
+            )
+            connection.commit()
+            return connection.total_changes - before
+
+    def import_file(self, path, language=None, category=None, difficulty=None,
+                    delimiter=None, batch_size=default_import_batch_size):
+        """
+        Bulk import a CSV or TSV phrase list.
+        Files with a header may use the columns language, text, category and difficulty;
+        files without one are read as text[, category[, difficulty]] for the given language.
+        Returns the number of new phrases.
+        """
+        if delimiter is None:
+            delimiter = "\t" if path.lower().endswith((".tsv", ".tab")) else ","
+
+        imported = 0
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f, delimiter=delimiter)
+            header = next(reader, None)
+            if header is None:
+                return 0
+            columns = [name.strip().lower() for name in header]
+            if "text" in columns:
+                index = {name: columns.index(name) for name in columns}
+            else:
+                # No header: the first line is data
+                index = {"text": 0, "category": 1, "difficulty": 2}
+                reader = _chain([header], reader)
+
+            def field(row, name, default):
+                position = index.get(name)
+                if position is None or position >= len(row) or not row[position].strip():
+                    return default
+                return row[position]
+
+            batch = []
+            for row in reader:
+                row_language = field(row, "language", language)
+                batch.append((
+                    row_language,
+                    field(row, "text", None),
+                    field(row, "category", category),
+                    field(row, "difficulty", difficulty)
+                ))
+                if len(batch) >= batch_size:
+                    imported += self.add_phrases(batch)
+                    batch = []
+            imported += self.add_phrases(batch)
+        return imported
+
+    def seed(self, starter_phrases):
+        """Load the starter phrase set into an empty corpus"""
+        with self._lock:
+            empty = self._connect().execute("SELECT 1 FROM phrases LIMIT 1").fetchone() is None
+        if empty:
+            self.add_phrases(
+                (language, text, category, difficulty)
+                for language, phrases in starter_phrases.items()
+                for text, category, difficulty in phrases
+            )
+
+    def cursor(self, language, category=None, difficulty=None):
+        return PhraseCursor(self, language, category, difficulty)
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def _chain(first, rest):
+    yield from first
+    yield from rest
+
+
+class PhraseCursor:
+    """
+    Position in a filtered view of the corpus.
+    Only one page of phrases is held in memory; moving past either end of it
+    loads the neighbouring page, and moving past the end of the corpus wraps around.
+    """
+
+    def __init__(self, corpus, language, category=None, difficulty=None):
+        self.corpus = corpus
+        self.language = language
+        self.category = category
+        self.difficulty = difficulty
+        self._window = None
+        self._position = 0
+
+    def _filters(self):
+        return {"category": self.category, "difficulty": self.difficulty}
+
+    def current(self):
+        if self._window is None:
+            self._window = self.corpus.page(self.language, **self._filters())
+            self._position = 0
+        return self._window[self._position] if self._window else None
+
+    def _page_after(self, phrase):
+        page = self.corpus.page(self.language, after_id=phrase.id, **self._filters())
+        return page or self.corpus.page(self.language, **self._filters())
+
+    def _page_before(self, phrase):
+        page = self.corpus.page_before(self.language, before_id=phrase.id, **self._filters())
+        return page or self.corpus.page_before(self.language, **self._filters())
+
+    def next(self):
+        phrase = self.current()
+        if phrase is None:
+            return None
+        if self._position + 1 < len(self._window):
+            self._position += 1
+        else:
+            self._window = self._page_after(phrase)
+            self._position = 0
+        return self.current()
+
+    def previous(self):
+        phrase = self.current()
+        if phrase is None:
+            return None
+        if self._position > 0:
+            self._position -= 1
+        else:
+            self._window = self._page_before(phrase)
+            self._position = len(self._window) - 1
+        return self.current()
+
+    def peek_next(self):
+        phrase = self.current()
+        if phrase is None:
+            return None
+        if self._position + 1 < len(self._window):
+            return self._window[self._position + 1]
+        page = self.corpus.page(self.language, after_id=phrase.id, limit=1, **self._filters())
+        return page[0] if page else self.corpus.page(self.language, limit=1, **self._filters())[0]
+
+    def peek_previous(self):
+        phrase = self.current()
+        if phrase is None:
+            return None
+        if self._position > 0:
+            return self._window[self._position - 1]
+        page = self.corpus.page_before(self.language, before_id=phrase.id, limit=1, **self._filters())
+        return page[0] if page else self.corpus.page_before(self.language, limit=1, **self._filters())[0]
+
+    def jump_to(self, phrase):
+        """Make the given phrase current and load the page that starts with it"""
+        if phrase is None:
+            return None
+        self._window = self.corpus.page(self.language, after_id=phrase.id - 1, **self._filters())
+        self._position = 0
+        return self.current()
+
+    def random(self):
+        return self.jump_to(self.corpus.random_phrase(self.language, **self._filters()))
+
+
+_phrase_corpus = None
+_phrase_corpus_lock = threading.Lock()
+
+
+def get_phrase_corpus():
+    """Return the shared phrase corpus, creating and seeding it on first use"""
+    global _phrase_corpus
+    with _phrase_corpus_lock:
+        if _phrase_corpus is None:
+            from Categories import STARTER_PHRASES
+            _phrase_corpus = PhraseCorpus()
+            _phrase_corpus.seed(STARTER_PHRASES)
+        return _phrase_corpus
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import a CSV/TSV phrase list into the phrase corpus")
+    parser.add_argument("path", help="CSV or TSV file to import")
+    parser.add_argument("--language", help="Language code for rows without a language column, e.g. ES")
+    parser.add_argument("--category", help="Category for rows without a category column")
+    parser.add_argument("--difficulty", type=int, help="Difficulty for rows without a difficulty column")
+    parser.add_argument("--database", default=corpus_file, help="Corpus database to import into")
+    args = parser.parse_args()
+
+    corpus = PhraseCorpus(args.database)
+    count = corpus.import_file(args.path, args.language, args.category, args.difficulty)
+    print(f"Imported {count} new phrases into {args.database}")
@@ -0,0 +1,281 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque, namedtuple
+
+import speech_recognition as sr
+
+from utility.config_manager import get_settings, RecognitionSettings
+
+try:
+    import vosk
+except ImportError:
+    vosk = None
+
+# Recognition locales for the DeepL language codes used throughout the app
+recognition_locales = {
+    "EN": "en-US",
+    "ES": "es-ES",
+    "FR": "fr-FR",
+    "DE": "de-DE",
+    "JA": "ja-JP",
+    "IT": "it-IT"
+}
+
+# Backends tried in order until one of them is available
+default_backend_order = ["google", "sphinx"]
+default_max_alternatives = 5
+
+# One recognition alternative; confidence is None when the engine does not report one
+Hypothesis = namedtuple("Hypothesis", "transcript confidence")
+
+
+def recognition_language(language_code):
+    """Map a DeepL language code such as "ES" to a recognition locale such as "es-ES" """
+    if not language_code:
+        return recognition_locales["EN"]
+    return recognition_locales.get(language_code.upper(), language_code)
+
+
+class RecognitionError(Exception):
+    """Raised when a backend cannot be used, so the next backend should be tried"""
+
+
+class RecognitionBackend:
+    """Turns captured AudioData into text for a given recognition locale"""
+
+    name = "base"
+
+    def recognize_alternatives(self, audio, language):
+        """Return the n-best Hypothesis list, best first; empty if nothing was recognized"""
+        raise NotImplementedError
+
+    def recognize(self, audio, language):
+        """Return the best transcript, or None if the audio contained no recognizable speech"""
+        alternatives = self.recognize_alternatives(audio, language)
+        return alternatives[0].transcript if alternatives else None
+
+
+class GoogleBackend(RecognitionBackend):
+    """Google Web Speech API via speech_recognition; needs a network connection"""
+
+    name = "google"
+
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+
+    def recognize_alternatives(self, audio, language):
+        try:
+            # show_all returns the raw response with every alternative
+            response = self.recognizer.recognize_google(audio, language=language, show_all=True)
+        except sr.UnknownValueError:
+            return []
+        except sr.RequestError as e:
+            raise RecognitionError(f"Google recognition unavailable: {e}")
+        if not isinstance(response, dict):
+            return []
+        return [
+            Hypothesis(alternative["transcript"], alternative.get("confidence"))
+            for alternative in response.get("alternative", [])
+            if alternative.get("transcript")
+        ]
+
+
+class SphinxBackend(RecognitionBackend):
+    """Offline CMU PocketSphinx; only languages with an installed model are supported"""
+
+    name = "sphinx"
+
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+
+    def recognize_alternatives(self, audio, language):
+        try:
+            transcript = self.recognizer.recognize_sphinx(audio, language=language)
+        except sr.UnknownValueError:
+            return []
+        except (sr.RequestError, ImportError) as e:
+            raise RecognitionError(f"Sphinx recognition unavailable: {e}")
+        return [Hypothesis(transcript, None)] if transcript else []
+
+
+class VoskBackend(RecognitionBackend):
+    """Offline Vosk recognition using one downloaded model directory per locale"""
+
+    name = "vosk"
+
+    def __init__(self, model_paths=None, max_alternatives=default_max_alternatives):
+        # locale or DeepL code -> path of an unpacked Vosk model
+        self.model_paths = model_paths or {}
+        self.max_alternatives = max_alternatives
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def _model(self, language):
+        path = self.model_paths.get(language) or self.model_paths.get(language.split("-")[0].upper())
+        if vosk is None:
+            raise RecognitionError("Vosk recognition unavailable: vosk is not installed")
+        if not path or not os.path.isdir(path):
+            raise RecognitionError(f"Vosk recognition unavailable: no model for {language}")
+        with self._lock:
+            if path not in self._models:
+                self._models[path] = vosk.Model(path)
+            return self._models[path]
+
+    def recognize_alternatives(self, audio, language):
+        model = self._model(language)
+        recognizer = vosk.KaldiRecognizer(model, 16000)
+        recognizer.SetMaxAlternatives(self.max_alternatives)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=16000, convert_width=2))
+        result = json.loads(recognizer.FinalResult())
+        alternatives = result.get("alternatives")
+        if alternatives is None:
+            alternatives = [{"text": result.get("text", "")}]
+        return [
+            Hypothesis(alternative["text"], alternative.get("confidence"))
+            for alternative in alternatives
+            if alternative.get("text")
+        ]
+
+
+class ReplayBackend(RecognitionBackend):
+    """
+    Serves canned transcripts for recorded fixtures.
+    Transcripts are looked up by a hash of the raw audio; unknown audio takes
+    the next queued transcript, if any. A transcript may also be a list of
+    alternatives, best first.
+    """
+
+    name = "replay"
+
+    def __init__(self, transcripts=None, queued=None):
+        self.transcripts = dict(transcripts or {})
+        self.queued = deque(queued or [])
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(audio):
+        return hashlib.sha1(audio.get_raw_data()).hexdigest()
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a JSON file of {"transcripts": {fingerprint: text}, "queued": [text, ...]}"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("transcripts"), data.get("queued"))
+
+    def add(self, audio, transcript):
+        with self._lock:
+            self.transcripts[self.fingerprint(audio)] = transcript
+
+    def recognize_alternatives(self, audio, language):
+        with self._lock:
+            transcript = self.transcripts.get(self.fingerprint(audio))
+            if transcript is None and self.queued:
+                transcript = self.queued.popleft()
+        if transcript is None:
+            raise RecognitionError("Replay recognition has no transcript for this audio")
+        if isinstance(transcript, str):
+            transcript = [transcript]
+        return [Hypothesis(text, None) for text in transcript if text]
+
+
+backend_classes = {
+    GoogleBackend.name: GoogleBackend,
+    SphinxBackend.name: SphinxBackend,
+    VoskBackend.name: VoskBackend,
+    ReplayBackend.name: ReplayBackend
+}
+
+
+class RecognitionService:
+    """Tries backends in order, failing over when one is unavailable, and tracks their latency"""
+
+    def __init__(self, backends):
+        self.backends = list(backends)
+        self._stats = {backend.name: {"calls": 0, "failures": 0, "total_latency": 0.0, "last_latency": None}
+                       for backend in self.backends}
+        self._lock = threading.Lock()
+
+    def recognize_alternatives(self, audio, language):
+        """Return (hypotheses, backend_name); hypotheses is empty if nothing was understood"""
+        for backend in self.backends:
+            start = time.perf_counter()
+            try:
+                alternatives = backend.recognize_alternatives(audio, language)
+            except RecognitionError as e:
+                self._record(backend.name, time.perf_counter() - start, failed=True)
+                print(f"{e}; trying next backend")
+                continue
+            latency = self._record(backend.name, time.perf_counter() - start)
+            print(f"Recognized with {backend.name} in {latency * 1000:.0f} ms ({len(alternatives)} alternatives)")
+            return alternatives, backend.name
+        print("No speech recognition backend was available")
+        return [], None
+
+    def recognize(self, audio, language):
+        """Return (transcript, backend_name); transcript is None if nothing was understood"""
+        alternatives, backend = self.recognize_alternatives(audio, language)
+        return (alternatives[0].transcript if alternatives else None), backend
+
+    def _record(self, name, latency, failed=False):
+        with self._lock:
+            stats = self._stats[name]
+            stats["calls"] += 1
+            stats["last_latency"] = latency
+            stats["total_latency"] += latency
+            if failed:
+                stats["failures"] += 1
+        return latency
+
+    def stats(self):
+        """Per-backend call counts, failures, last and mean latency in seconds"""
+        with self._lock:
+            report = {}
+            for name, stats in self._stats.items():
+                report[name] = dict(stats)
+                report[name]["mean_latency"] = stats["total_latency"] / stats["calls"] if stats["calls"] else None
+            return report
+
+
+def create_backends(names, options=None):
+    """Instantiate backends by name; options maps a name to its constructor arguments"""
+    options = options or {}
+    backends = []
+    for name in names:
+        backend_class = backend_classes.get(name)
+        if backend_class is None:
+            print(f"Unknown recognition backend: {name}")
+            continue
+        backends.append(backend_class(**options.get(name, {})))
+    return backends
+
+
+_recognition_service = None
+_recognition_service_lock = threading.Lock()
+
+
+def get_recognition_service():
+    """Return the shared recognition service, creating it on first use"""
+    global _recognition_service
+    with _recognition_service_lock:
+        if _recognition_service is None:
+            settings = get_settings(RecognitionSettings)
+            model_paths = {
+                language: os.path.expanduser(path)
+                for language, path in (settings.vosk_model_paths or {}).items()
+            }
+            options = {VoskBackend.name: {"model_paths": model_paths}}
+            _recognition_service = RecognitionService(
+                create_backends(settings.backends or default_backend_order, options)
+            )
+        return _recognition_service
+
+
+def set_recognition_service(service):
+    """Replace the shared service, e.g. with a ReplayBackend for automated runs"""
+    global _recognition_service
+    with _recognition_service_lock:
+        _recognition_service = service
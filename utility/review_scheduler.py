@@ -0,0 +1,332 @@
+import hashlib
+import heapq
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+# Default location of the review schedule and SM-2 parameters
+schedule_file = os.path.join(os.path.dirname(__file__), "review_schedule.db")
+default_ease = 2.5
+minimum_ease = 1.3
+relearn_seconds = 600  # Failed cards come back within the same session
+skip_seconds = 300  # A served card that is skipped without an attempt waits this long
+day_seconds = 86400
+default_batch_size = 500
+default_flush_interval = 0.25  # Seconds the writer waits to group reviews into one commit
+
+Card = namedtuple("Card", "card_id deck language prompt answer repetitions interval_days ease lapses due_at last_review")
+
+_stop = object()
+
+_columns = "card_id, deck, language, prompt, answer, repetitions, interval_days, ease, lapses, due_at, last_review"
+
+
+def phrase_card_id(phrase_id):
+    return f"phrase:{phrase_id}"
+
+
+def translation_card_id(prompt, answer):
+    digest = hashlib.sha1(f"{prompt}\n{answer}".encode("utf-8")).hexdigest()[:16]
+    return f"translation:{digest}"
+
+
+def quality_from_score(score):
+    """Map a pronunciation score in [0, 1] to an SM-2 quality grade 0-5"""
+    if score >= 0.95:
+        return 5
+    if score >= 0.85:
+        return 4
+    if score >= 0.7:
+        return 3
+    if score >= 0.5:
+        return 2
+    if score >= 0.2:
+        return 1
+    return 0
+
+
+def sm2(card, quality, now):
+    """Return the card's next state after a review graded 0-5 (SM-2)"""
+    repetitions, interval_days, ease, lapses = card.repetitions, card.interval_days, card.ease, card.lapses
+    if quality < 3:
+        repetitions = 0
+        interval_days = 1
+        lapses += 1
+        due_at = now + relearn_seconds
+    else:
+        if repetitions == 0:
+            interval_days = 1
+        elif repetitions == 1:
+            interval_days = 6
+        else:
+            interval_days = round(interval_days * ease)
+        repetitions += 1
+        due_at = now + interval_days * day_seconds
+    ease = max(minimum_ease, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return card._replace(
+        repetitions=repetitions, interval_days=interval_days, ease=ease,
+        lapses=lapses, due_at=due_at, last_review=now
+    )
+
+
+class _Deck:
+    """Cards of one kind in one language with a due-date heap (lazy deletion)"""
+
+    def __init__(self, cards):
+        self.cards = {card.card_id: card for card in cards}
+        # card_id -> due time of its live heap entry; other entries for the card are stale
+        self.queued = {card.card_id: card.due_at for card in cards}
+        self.heap = [(card.due_at, card.card_id) for card in cards]
+        heapq.heapify(self.heap)
+
+    def push(self, card_id, due_at):
+        self.queued[card_id] = due_at
+        heapq.heappush(self.heap, (due_at, card_id))
+        if len(self.heap) > 2 * len(self.queued) + 64:
+            # Too many stale entries: rebuild from the live ones
+            self.heap = [(due, key) for key, due in self.queued.items()]
+            heapq.heapify(self.heap)
+
+    def peek(self):
+        while self.heap:
+            due_at, card_id = self.heap[0]
+            if self.queued.get(card_id) == due_at:
+                return due_at, card_id
+            heapq.heappop(self.heap)
+        return None
+
+
+class ReviewScheduler:
+    """
+    SM-2 spaced repetition.
+    Each (language, deck) is loaded from SQLite into a heap ordered by due date,
+    so finding the next due card is O(log n). Loading and saving happen on a
+    dedicated writer thread: review() only queues the grade, and lookups on a
+    deck that is not in memory yet return None while it loads in the background.
+    """
+
+    def __init__(self, path=schedule_file, batch_size=default_batch_size, flush_interval=default_flush_interval):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._decks = {}
+        self._loading = set()
+        self._queue = queue.SimpleQueue()
+        self._writer = None
+        self._closed = False
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(
+            "CREATE TABLE IF NOT EXISTS cards ("
+            " language TEXT NOT NULL,"
+            " card_id TEXT NOT NULL,"
+            " deck TEXT NOT NULL,"
+            " prompt TEXT NOT NULL,"
+            " answer TEXT,"
+            " repetitions INTEGER NOT NULL,"
+            " interval_days INTEGER NOT NULL,"
+            " ease REAL NOT NULL,"
+            " lapses INTEGER NOT NULL,"
+            " due_at REAL NOT NULL,"
+            " last_review REAL,"
+            " PRIMARY KEY (language, card_id));"
+            "CREATE INDEX IF NOT EXISTS idx_cards_due ON cards (language, deck, due_at);"
+        )
+        connection.commit()
+        return connection
+
+    def _put(self, item):
+        with self._lock:
+            if self._closed:
+                return False
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name="review-schedule-writer", daemon=True)
+                self._writer.start()
+        self._queue.put(item)
+        return True
+
+    def _loaded_deck(self, language, deck):
+        # The deck if it is in memory; otherwise ask the writer to load it
+        key = (language.upper(), deck)
+        with self._lock:
+            loaded = self._decks.get(key)
+            if loaded is None and key not in self._loading:
+                self._loading.add(key)
+                self._put(("load", key))
+            return loaded
+
+    def preload(self, language, deck):
+        """Start loading a deck in the background so later lookups find it in memory"""
+        self._loaded_deck(language, deck)
+
+    def is_loaded(self, language, deck):
+        with self._lock:
+            return (language.upper(), deck) in self._decks
+
+    def _run(self):
+        connection = self._connect()
+        running = True
+        while running:
+            cards = {}
+            markers = []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _stop:
+                    running = False
+                    break
+                if isinstance(item, threading.Event):
+                    # A flush() marker: write what we have before signalling
+                    markers.append(item)
+                    break
+                try:
+                    if item[0] == "load":
+                        self._load(connection, item[1])
+                    else:
+                        card = self._apply_review(connection, *item[1])
+                        cards[(card.language, card.card_id)] = card
+                except sqlite3.Error as e:
+                    print(f"Error reading review schedule: {e}")
+                    if item[0] == "load":
+                        # Let the next lookup try again
+                        with self._lock:
+                            self._loading.discard(item[1])
+                if len(cards) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if cards:
+                try:
+                    with connection:
+                        self._save(connection, list(cards.values()))
+                except sqlite3.Error as e:
+                    print(f"Error saving review schedule: {e}")
+            for marker in markers:
+                marker.set()
+        connection.close()
+
+    def _load(self, connection, key):
+        with self._lock:
+            if key in self._decks:
+                return self._decks[key]
+        rows = connection.execute(
+            f"SELECT {_columns} FROM cards WHERE language = ? AND deck = ?", key
+        ).fetchall()
+        # The heap is built outside the lock so lookups on other decks are not held up
+        deck = _Deck([Card(*row) for row in rows])
+        with self._lock:
+            self._loading.discard(key)
+            return self._decks.setdefault(key, deck)
+
+    def _apply_review(self, connection, language, card_id, quality, prompt, answer, now):
+        deck_name = card_id.split(":", 1)[0]
+        deck = self._load(connection, (language, deck_name))
+        with self._lock:
+            card = deck.cards.get(card_id)
+            if card is None:
+                card = Card(card_id, deck_name, language, prompt, answer, 0, 0, default_ease, 0, now, None)
+            card = sm2(card._replace(prompt=prompt, answer=answer), quality, now)
+            deck.cards[card_id] = card
+            deck.push(card_id, card.due_at)
+            return card
+
+    def _save(self, connection, cards):
+        connection.executemany(
+            f"INSERT INTO cards ({_columns}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (language, card_id) DO UPDATE SET"
+            " prompt = excluded.prompt, answer = excluded.answer,"
+            " repetitions = excluded.repetitions, interval_days = excluded.interval_days,"
+            " ease = excluded.ease, lapses = excluded.lapses,"
+            " due_at = excluded.due_at, last_review = excluded.last_review",
+            cards
+        )
+
+    def get(self, language, card_id):
+        """The card's current state, or None if it is unknown or its deck is still loading"""
+        deck = self._loaded_deck(language, card_id.split(":", 1)[0])
+        with self._lock:
+            return deck.cards.get(card_id) if deck is not None else None
+
+    def next_due(self, language, deck, now=None):
+        """The earliest card that is due, without taking it"""
+        now = time.time() if now is None else now
+        with self._lock:
+            loaded = self._loaded_deck(language, deck)
+            entry = loaded.peek() if loaded is not None else None
+            if entry is None or entry[0] > now:
+                return None
+            return loaded.cards[entry[1]]
+
+    def take_due(self, language, deck, now=None):
+        """
+        Take the earliest due card to show it.
+        It is pushed back by skip_seconds (in memory only) so skipping it
+        does not serve it again straight away; review() reschedules it properly.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            card = self.next_due(language, deck, now)
+            if card is not None:
+                self._decks[(language.upper(), deck)].push(card.card_id, now + skip_seconds)
+            return card
+
+    def review(self, language, card_id, quality, prompt, answer=None, now=None):
+        """
+        Grade a review (0-5), creating the card on its first review.
+        Only queues the grade; the writer thread applies SM-2 and persists it.
+        """
+        now = time.time() if now is None else now
+        self._put(("review", (language.upper(), card_id, quality, prompt, answer, now)))
+
+    def flush(self, timeout=5.0):
+        """Wait until everything queued so far has been applied and committed"""
+        if self._writer is None or not self._writer.is_alive():
+            return True
+        marker = threading.Event()
+        self._queue.put(marker)
+        return marker.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Write out queued reviews and stop the writer thread"""
+        with self._lock:
+            self._closed = True
+            writer = self._writer
+        if writer is not None and writer.is_alive():
+            self._queue.put(_stop)
+            writer.join(timeout)
+        with self._lock:
+            self._decks.clear()
+            self._loading.clear()
+
+
+_review_scheduler = None
+_review_scheduler_lock = threading.Lock()
+
+
+def get_review_scheduler():
+    """Return the shared review scheduler, creating it on first use"""
+    global _review_scheduler
+    with _review_scheduler_lock:
+        if _review_scheduler is None:
+            _review_scheduler = ReviewScheduler()
+        return _review_scheduler
+
+
+def close_review_scheduler(timeout=5.0):
+    global _review_scheduler
+    with _review_scheduler_lock:
+        scheduler = _review_scheduler
+        _review_scheduler = None
+    if scheduler is not None:
+        scheduler.close(timeout)
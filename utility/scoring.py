@@ -0,0 +1,232 @@
+from collections import namedtuple
+from functools import lru_cache
+
+from utility.tokenization import tokenize
+
+# One aligned word: op is "match", "substitute", "delete" (expected word missing)
+# or "insert" (extra word said); similarity is the character-level score in [0, 1]
+WordOp = namedtuple("WordOp", "op expected actual similarity")
+ScoreResult = namedtuple("ScoreResult", "score operations")
+
+insert_penalty = 0.5  # Extra words count against the score, but less than missing ones
+
+# Alignments needing more edits than this fall back to a positional comparison,
+# which keeps scoring linear in sentence length: O((N + M) * max_edits)
+max_edits = 64
+
+
+def myers_diff(a, b, max_d=None):
+    """
+    Shortest edit script between two sequences using Myers' O(ND) algorithm.
+    Returns a list of ("equal" | "delete" | "insert", a_index, b_index) steps,
+    or None if more than max_d edits would be needed.
+    """
+    n, m = len(a), len(b)
+    v = {1: 0}
+    trace = []
+    limit = n + m if max_d is None else min(n + m, max_d)
+    for d in range(limit + 1):
+        trace.append(dict(v))
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
+            else:
+                x = v[k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+    return None
+
+
+def _backtrack(trace, x, y):
+    steps = []
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v.get(k - 1, -1) < v.get(k + 1, -1)):
+            previous_k = k + 1
+        else:
+            previous_k = k - 1
+        previous_x = v[previous_k]
+        previous_y = previous_x - previous_k
+        while x > previous_x and y > previous_y:
+            steps.append(("equal", x - 1, y - 1))
+            x -= 1
+            y -= 1
+        if d > 0:
+            if x == previous_x:
+                steps.append(("insert", None, y - 1))
+            else:
+                steps.append(("delete", x - 1, None))
+        x, y = previous_x, previous_y
+    steps.reverse()
+    return steps
+
+
+def edit_distance(a, b):
+    """Number of insertions plus deletions needed to turn a into b"""
+    return sum(1 for op, _, _ in myers_diff(a, b) if op != "equal")
+
+
+@lru_cache(maxsize=65536)
+def char_similarity(a, b):
+    """Character-level similarity of two words, 1.0 for identical and 0.0 for disjoint"""
+    if a == b:
+        return 1.0
+    total = len(a) + len(b)
+    if total == 0:
+        return 1.0
+    return 1.0 - edit_distance(a, b) / total
+
+
+def align_words(expected_words, actual_words, expected_keys=None, actual_keys=None):
+    """
+    Align two word lists and return WordOps.
+    Keys (e.g. normalized words) are compared; the original words are reported.
+    Runs of deletions and insertions between matches are paired into substitutions.
+    """
+    expected_keys = expected_words if expected_keys is None else expected_keys
+    actual_keys = actual_words if actual_keys is None else actual_keys
+
+    operations = []
+    deleted = []
+    inserted = []
+
+    def flush():
+        for i, j in zip(deleted, inserted):
+            operations.append(WordOp("substitute", expected_words[i], actual_words[j],
+                                     char_similarity(expected_keys[i], actual_keys[j])))
+        for i in deleted[len(inserted):]:
+            operations.append(WordOp("delete", expected_words[i], None, 0.0))
+        for j in inserted[len(deleted):]:
+            operations.append(WordOp("insert", None, actual_words[j], 0.0))
+        deleted.clear()
+        inserted.clear()
+
+    steps = myers_diff(expected_keys, actual_keys, max_edits)
+    if steps is None:
+        steps = _positional_steps(len(expected_keys), len(actual_keys))
+
+    for op, i, j in steps:
+        if op == "equal":
+            flush()
+            operations.append(WordOp("match", expected_words[i], actual_words[j], 1.0))
+        elif op == "delete":
+            deleted.append(i)
+        else:
+            inserted.append(j)
+    flush()
+    return operations
+
+
+def _positional_steps(n, m):
+    # Linear fallback for very different sentences: compare tokens position by position
+    # (unequal pairs become substitutions when the runs are flushed)
+    steps = []
+    for index in range(max(n, m)):
+        if index < n:
+            steps.append(("delete", index, None))
+        if index < m:
+            steps.append(("insert", None, index))
+    return steps
+
+
+def score_operations(operations):
+    """Overall score in [0, 1]: matched words count fully, near misses partially"""
+    expected = 0
+    credit = 0.0
+    penalty = 0.0
+    for operation in operations:
+        if operation.op == "insert":
+            penalty += insert_penalty
+            continue
+        expected += 1
+        credit += operation.similarity
+    denominator = expected + penalty
+    if denominator == 0:
+        return 1.0
+    return credit / denominator
+
+
+def _prepare(text, normalize):
+    # Whitespace words for Latin scripts, character tokens for CJK scripts
+    words = list(tokenize(text)) if text else []
+    if not normalize:
+        return words, words
+    # The whole sentence is normalized before tokenizing, so rules that split
+    # words (elisions such as "l'eau") shape the alignment; stray punctuation
+    # normalizes to nothing and takes no part in it
+    keys = list(tokenize(normalize(text) or "")) if text else []
+    return _display_words(words, keys, normalize), keys
+
+
+def _display_words(words, keys, normalize):
+    # Original word shown in feedback for each key; a word split into several
+    # keys is shown as those keys
+    display = []
+    for word in words:
+        parts = tokenize(normalize(word) or "")
+        if len(parts) == 1:
+            display.append(word)
+        else:
+            display.extend(parts)
+    if len(display) != len(keys):
+        # Normalization depended on context; show the normalized words instead
+        return list(keys)
+    return display
+
+
+def score_attempt(target, attempt, normalize=None):
+    """Score a spoken attempt against the target sentence"""
+    return score_many(target, [attempt], normalize)[0]
+
+
+def score_many(target, attempts, normalize=None):
+    """
+    Score many attempts against one target.
+    The target is tokenized once and word comparisons are memoized across attempts.
+    """
+    target_words, target_keys = _prepare(target, normalize)
+    results = []
+    for attempt in attempts:
+        if not attempt:
+            operations = [WordOp("delete", word, None, 0.0) for word in target_words]
+            results.append(ScoreResult(0.0, operations))
+            continue
+        words, keys = _prepare(attempt, normalize)
+        operations = align_words(target_words, words, target_keys, keys)
+        results.append(ScoreResult(score_operations(operations), operations))
+    return results
+
+
+def best_hypothesis(target, hypotheses, normalize=None):
+    """
+    Score every recognition alternative against the target in one batch.
+    hypotheses are (transcript, confidence) pairs; returns (hypothesis, ScoreResult)
+    for the best match, preferring the recognizer's confidence on ties.
+    """
+    if not hypotheses:
+        return None, ScoreResult(0.0, [])
+    results = score_many(target, [hypothesis[0] for hypothesis in hypotheses], normalize)
+    best = max(
+        range(len(hypotheses)),
+        key=lambda i: (results[i].score, hypotheses[i][1] or 0.0, -i)
+    )
+    return hypotheses[best], results[best]
+
+
+def describe_operations(operations):
+    """Short human-readable feedback about the words that did not match"""
+    notes = []
+    for operation in operations:
+        if operation.op == "substitute":
+            notes.append(f"'{operation.expected}' sounded like '{operation.actual}'")
+        elif operation.op == "delete":
+            notes.append(f"missed '{operation.expected}'")
+        elif operation.op == "insert":
+            notes.append(f"extra '{operation.actual}'")
+    return "; ".join(notes)
@@ -0,0 +1,109 @@
+import builtins
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Time-to-first-paint above this is reported as over budget
+default_budget_ms = 1500
+
+
+class StartupProfiler:
+    """
+    Times startup phases and module imports (enabled with main.py --profile-startup).
+    When disabled, phase() costs next to nothing and imports are not hooked.
+    """
+
+    def __init__(self, enabled=False, budget_ms=default_budget_ms):
+        self.enabled = enabled
+        self.budget_ms = budget_ms
+        self.started_at = time.perf_counter()
+        self.phases = []  # (name, milliseconds)
+        self.imports = {}  # module name -> (inclusive ms, self ms)
+        self._original_import = None
+        self._stack = []
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, (time.perf_counter() - start) * 1000))
+
+    def install_import_timer(self):
+        """Wrap __import__ so every module loaded from now on is timed"""
+        if not self.enabled or self._original_import is not None:
+            return
+        self._original_import = builtins.__import__
+        main_thread = threading.main_thread()
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            # Only first loads on the main thread are timed; everything else passes through
+            if (level != 0 or name in sys.modules
+                    or threading.current_thread() is not main_thread):
+                return self._original_import(name, globals, locals, fromlist, level)
+            self._stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return self._original_import(name, globals, locals, fromlist, level)
+            finally:
+                elapsed = (time.perf_counter() - start) * 1000
+                children = self._stack.pop()
+                if self._stack:
+                    self._stack[-1] += elapsed
+                if name not in self.imports:
+                    self.imports[name] = (elapsed, elapsed - children)
+
+        builtins.__import__ = timed_import
+
+    def remove_import_timer(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def first_paint(self):
+        """Record time-to-first-paint and print the report"""
+        if not self.enabled:
+            return
+        elapsed = (time.perf_counter() - self.started_at) * 1000
+        self.phases.append(("first paint (since start)", elapsed))
+        self.remove_import_timer()
+        print(self.report(elapsed))
+
+    def report(self, first_paint_ms=None, top=15):
+        lines = ["Startup profile", "  Phases:"]
+        for name, ms in self.phases:
+            lines.append(f"    {ms:8.1f} ms  {name}")
+        lines.append(f"  Slowest imports (top {top}, self / inclusive):")
+        slowest = sorted(self.imports.items(), key=lambda item: item[1][1], reverse=True)[:top]
+        for name, (inclusive, own) in slowest:
+            lines.append(f"    {own:8.1f} / {inclusive:8.1f} ms  {name}")
+        if first_paint_ms is not None:
+            verdict = "within" if first_paint_ms <= self.budget_ms else "OVER"
+            lines.append(f"  Time to first paint: {first_paint_ms:.1f} ms ({verdict} the {self.budget_ms} ms budget)")
+        return "\n".join(lines)
+
+
+_profiler = StartupProfiler()
+
+
+def get_profiler():
+    return _profiler
+
+
+def enable_profiler(budget_ms=default_budget_ms):
+    """Turn on profiling for this run; call before importing the application"""
+    global _profiler
+    started_at = _profiler.started_at
+    _profiler = StartupProfiler(enabled=True, budget_ms=budget_ms)
+    _profiler.started_at = started_at
+    _profiler.install_import_timer()
+    return _profiler
+
+
+def phase(name):
+    return _profiler.phase(name)
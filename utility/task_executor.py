@@ -0,0 +1,160 @@
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from utility.config_manager import get_settings, PoolSettings
+
+# Lower numbers run first within a pool
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 10
+
+# Worker threads per resource class
+default_pool_sizes = {
+    "network": 4,  # Translation requests
+    "tts": 2,      # Speech synthesis
+    "audio": 1,    # Playback; one clip at a time
+    "mic": 1       # Microphone capture; one recording at a time
+}
+
+_stop_priority = float("inf")
+
+
+def _join_all(threads, timeout=None):
+    # timeout bounds the whole wait, not each join
+    deadline = None if timeout is None else time.monotonic() + timeout
+    for thread in threads:
+        if deadline is None:
+            thread.join()
+        else:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+
+class WorkerPool:
+    """Bounded pool of daemon worker threads that run tasks in priority order"""
+
+    def __init__(self, name, max_workers):
+        self.name = name
+        self.max_workers = max_workers
+        self._queue = queue.PriorityQueue()
+        self._counter = itertools.count()  # Keeps FIFO order within a priority
+        self._threads = []
+        self._idle = threading.Semaphore(0)
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+    def submit(self, fn, *args, priority=PRIORITY_NORMAL, **kwargs):
+        """Queue fn(*args, **kwargs) and return a Future for its result"""
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError(f"Cannot submit to the '{self.name}' pool after shutdown")
+            future = Future()
+            self._queue.put((priority, next(self._counter), future, fn, args, kwargs))
+            self._adjust_threads()
+        return future
+
+    def _adjust_threads(self):
+        # Reuse an idle worker if there is one, otherwise grow up to the limit
+        if self._idle.acquire(blocking=False):
+            return
+        if len(self._threads) < self.max_workers:
+            thread = threading.Thread(
+                target=self._work, name=f"{self.name}-worker-{len(self._threads)}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            priority, _, future, fn, args, kwargs = self._queue.get()
+            if priority == _stop_priority:
+                return
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+            self._idle.release()
+
+    def shutdown(self, wait=True, cancel_futures=False, timeout=None):
+        """Stop accepting work, optionally cancel queued tasks, and stop the workers"""
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            if cancel_futures:
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    item[2].cancel()
+            # Stop markers sort after any remaining work
+            for _ in self._threads:
+                self._queue.put((_stop_priority, next(self._counter), None, None, None, None))
+            threads = list(self._threads)
+
+        if wait:
+            _join_all(threads, timeout)
+
+
+class TaskExecutor:
+    """Named worker pools, one per resource class"""
+
+    def __init__(self, pool_sizes=None):
+        self.pool_sizes = dict(default_pool_sizes)
+        if pool_sizes:
+            self.pool_sizes.update(pool_sizes)
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def pool(self, name):
+        with self._lock:
+            if name not in self._pools:
+                if name not in self.pool_sizes:
+                    raise ValueError(f"Unknown worker pool: {name}")
+                self._pools[name] = WorkerPool(name, self.pool_sizes[name])
+            return self._pools[name]
+
+    def submit(self, pool, fn, *args, priority=PRIORITY_NORMAL, **kwargs):
+        return self.pool(pool).submit(fn, *args, priority=priority, **kwargs)
+
+    def shutdown(self, wait=True, cancel_futures=True, timeout=None):
+        with self._lock:
+            pools = list(self._pools.values())
+        for worker_pool in pools:
+            worker_pool.shutdown(wait=False, cancel_futures=cancel_futures)
+        if wait:
+            _join_all([thread for worker_pool in pools for thread in worker_pool._threads], timeout)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return the shared task executor, creating it on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            settings = get_settings(PoolSettings)
+            _executor = TaskExecutor({name: getattr(settings, name) for name in default_pool_sizes})
+        return _executor
+
+
+def submit(pool, fn, *args, priority=PRIORITY_NORMAL, **kwargs):
+    """Run fn on the named shared pool and return a Future"""
+    return get_executor().submit(pool, fn, *args, priority=priority, **kwargs)
+
+
+def shutdown_executor(wait=True, cancel_futures=True, timeout=None):
+    """Cancel queued work and stop every worker pool, e.g. when the application exits"""
+    global _executor
+    with _executor_lock:
+        executor = _executor
+        _executor = None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=cancel_futures, timeout=timeout)
@@ -0,0 +1,107 @@
+import string
+import unicodedata
+from functools import lru_cache
+
+# Punctuation treated as a word boundary in every language
+punctuation = (
+    string.punctuation.replace("'", "")
+    + "¿¡«»“”„‟‹›—–…·•"          # Western typography
+    + "、。，．！？：；（）［］｛｝「」『』【】〈〉《》・〜"  # CJK and fullwidth marks
+)
+apostrophes = "'’‘`´ʼ＇"
+
+# Number words mapped to digits so "tres" and "3" compare equal
+number_words = {
+    "EN": {"zero": "0", "one": "1", "two": "2", "three": "3", "four": "4", "five": "5", "six": "6",
+           "seven": "7", "eight": "8", "nine": "9", "ten": "10", "eleven": "11", "twelve": "12",
+           "thirteen": "13", "fourteen": "14", "fifteen": "15", "sixteen": "16", "seventeen": "17",
+           "eighteen": "18", "nineteen": "19", "twenty": "20", "thirty": "30", "forty": "40",
+           "fifty": "50", "sixty": "60", "seventy": "70", "eighty": "80", "ninety": "90",
+           "hundred": "100"},
+    "ES": {"cero": "0", "uno": "1", "dos": "2", "tres": "3", "cuatro": "4", "cinco": "5", "seis": "6",
+           "siete": "7", "ocho": "8", "nueve": "9", "diez": "10", "once": "11", "doce": "12",
+           "trece": "13", "catorce": "14", "quince": "15", "dieciseis": "16", "diecisiete": "17",
+           "dieciocho": "18", "diecinueve": "19", "veinte": "20", "treinta": "30", "cuarenta": "40",
+           "cincuenta": "50", "sesenta": "60", "setenta": "70", "ochenta": "80", "noventa": "90",
+           "cien": "100"},
+    "FR": {"zero": "0", "deux": "2", "trois": "3", "quatre": "4", "cinq": "5", "six": "6",
+           "sept": "7", "huit": "8", "neuf": "9", "dix": "10", "onze": "11", "douze": "12",
+           "treize": "13", "quatorze": "14", "quinze": "15", "seize": "16", "vingt": "20",
+           "trente": "30", "quarante": "40", "cinquante": "50", "soixante": "60", "cent": "100"},
+    "DE": {"null": "0", "eins": "1", "zwei": "2", "drei": "3", "vier": "4", "funf": "5",
+           "sechs": "6", "sieben": "7", "acht": "8", "neun": "9", "zehn": "10", "elf": "11",
+           "zwolf": "12", "dreizehn": "13", "vierzehn": "14", "funfzehn": "15", "sechzehn": "16",
+           "siebzehn": "17", "achtzehn": "18", "neunzehn": "19", "zwanzig": "20", "dreissig": "30",
+           "vierzig": "40", "funfzig": "50", "sechzig": "60", "siebzig": "70", "achtzig": "80",
+           "neunzig": "90", "hundert": "100"},
+    "IT": {"zero": "0", "uno": "1", "due": "2", "tre": "3", "quattro": "4", "cinque": "5", "sei": "6",
+           "sette": "7", "otto": "8", "nove": "9", "dieci": "10", "undici": "11", "dodici": "12",
+           "tredici": "13", "quattordici": "14", "quindici": "15", "sedici": "16",
+           "diciassette": "17", "diciotto": "18", "diciannove": "19", "venti": "20", "trenta": "30",
+           "quaranta": "40", "cinquanta": "50", "sessanta": "60", "settanta": "70", "ottanta": "80",
+           "novanta": "90", "cento": "100"},
+    "JA": {}
+}
+
+# Per-language rules: how apostrophes are treated, and whether accents are stripped.
+# Elisions such as "l'eau" or "dov'è" become two words; English contractions stay whole.
+language_rules = {
+    None: {"apostrophe": "keep", "strip_accents": True, "form": "NFKD"},
+    "EN": {"apostrophe": "keep", "strip_accents": True, "form": "NFKD"},
+    "ES": {"apostrophe": "space", "strip_accents": True, "form": "NFKD"},
+    "FR": {"apostrophe": "space", "strip_accents": True, "form": "NFKD"},
+    "IT": {"apostrophe": "space", "strip_accents": True, "form": "NFKD"},
+    "DE": {"apostrophe": "remove", "strip_accents": True, "form": "NFKD"},
+    # Dakuten are combining marks after NFKD, so Japanese must keep them composed
+    "JA": {"apostrophe": "space", "strip_accents": False, "form": "NFKC"}
+}
+
+
+def _rules(language):
+    language = language.upper() if language else None
+    return language, language_rules.get(language, language_rules[None])
+
+
+@lru_cache(maxsize=None)
+def _combining_marks():
+    # Combining marks in the Basic Multilingual Plane, collected once
+    return [code for code in range(0x10000) if unicodedata.combining(chr(code))]
+
+
+@lru_cache(maxsize=None)
+def translation_table(language=None):
+    """Compile the str.translate table for a language's punctuation, apostrophe and accent rules"""
+    language, rules = _rules(language)
+    table = {ord(char): " " for char in punctuation}
+
+    apostrophe_rule = rules["apostrophe"]
+    for char in apostrophes:
+        if apostrophe_rule == "keep":
+            table[ord(char)] = "'"
+        elif apostrophe_rule == "space":
+            table[ord(char)] = " "
+        else:
+            table[ord(char)] = None
+
+    if rules["strip_accents"]:
+        for code in _combining_marks():
+            table[code] = None
+    return table
+
+
+@lru_cache(maxsize=16384)
+def normalize(text, language=None):
+    """
+    Normalize text for comparison: unicode form, casefolding, accent and
+    punctuation removal, apostrophe handling and number words, per language.
+    Results are memoized.
+    """
+    if text is None:
+        return None
+    language, rules = _rules(language)
+    normalized = unicodedata.normalize(rules["form"], text).casefold()
+    normalized = normalized.translate(translation_table(language))
+
+    numbers = number_words.get(language, number_words["EN"] if language is None else {})
+    words = [numbers.get(word, word) for word in normalized.split()]
+    return " ".join(words)
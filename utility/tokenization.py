@@ -0,0 +1,121 @@
+import re
+from functools import lru_cache
+
+# Unicode blocks written without spaces between words
+cjk_ranges = (
+    (0x3040, 0x309F),  # Hiragana
+    (0x30A0, 0x30FF),  # Katakana
+    (0x31F0, 0x31FF),  # Katakana phonetic extensions
+    (0x3400, 0x4DBF),  # CJK unified ideographs extension A
+    (0x4E00, 0x9FFF),  # CJK unified ideographs
+    (0xAC00, 0xD7AF),  # Hangul syllables
+    (0xF900, 0xFAFF),  # CJK compatibility ideographs
+    (0xFF66, 0xFF9F),  # Halfwidth katakana
+    (0x20000, 0x2FA1F)  # Supplementary ideographs
+)
+
+
+# Sentence ends: ASCII punctuation followed by a space, or full-width punctuation
+_sentence_end = re.compile(r"(?<=[.!?;])\s+|(?<=[。！？；])\s*")
+_clause_end = re.compile(r"(?<=[,:、，])\s*")
+
+# Speech is synthesized in chunks of roughly this many characters
+default_min_chunk_chars = 20
+default_max_chunk_chars = 200
+
+
+def is_cjk(char):
+    code = ord(char)
+    for start, end in cjk_ranges:
+        if start <= code <= end:
+            return True
+    return False
+
+
+@lru_cache(maxsize=16384)
+def tokenize(text, ngram=1):
+    """
+    Split text into scoring tokens in one linear pass.
+    Latin-script text splits on whitespace; runs of CJK characters, which have no
+    spaces, become character n-grams (single characters by default) so that a
+    partially correct Japanese sentence still earns partial credit.
+    Returns a tuple; results are memoized per phrase.
+    """
+    if not text:
+        return ()
+    tokens = []
+    word = []
+    run = []
+
+    def flush_word():
+        if word:
+            tokens.append("".join(word))
+            word.clear()
+
+    def flush_run():
+        if run:
+            if len(run) <= ngram:
+                tokens.append("".join(run))
+            else:
+                tokens.extend("".join(run[i:i + ngram]) for i in range(len(run) - ngram + 1))
+            run.clear()
+
+    for char in text:
+        if char.isspace():
+            flush_word()
+            flush_run()
+        elif is_cjk(char):
+            flush_word()
+            run.append(char)
+        else:
+            flush_run()
+            word.append(char)
+    flush_word()
+    flush_run()
+    return tuple(tokens)
+
+
+def _join(left, right):
+    # No space between chunks of text written without spaces
+    separator = "" if is_cjk(left[-1]) or left[-1] in "。！？；、，" else " "
+    return left + separator + right
+
+
+def _split_long(piece, max_chars):
+    # Break an over-long sentence at clause marks, then at spaces, then anywhere
+    if len(piece) <= max_chars:
+        return [piece]
+    for pattern in (_clause_end, re.compile(r"\s+")):
+        parts = [part for part in pattern.split(piece) if part]
+        if len(parts) > 1:
+            chunks = []
+            for part in parts:
+                if chunks and len(chunks[-1]) + len(part) + 1 <= max_chars:
+                    chunks[-1] = _join(chunks[-1], part)
+                else:
+                    chunks.extend(_split_long(part, max_chars))
+            return chunks
+    return [piece[i:i + max_chars] for i in range(0, len(piece), max_chars)]
+
+
+def split_sentences(text, min_chars=default_min_chunk_chars, max_chars=default_max_chunk_chars):
+    """
+    Split text into speakable chunks along sentence boundaries.
+    Very short sentences are joined to the next one and long ones are broken
+    at clauses, so each chunk stays between min_chars and max_chars where possible.
+    """
+    chunks = []
+    pending = ""
+    for sentence in _sentence_end.split(text.strip()):
+        if not sentence:
+            continue
+        pending = _join(pending, sentence) if pending else sentence
+        if len(pending) >= min_chars:
+            chunks.extend(_split_long(pending, max_chars))
+            pending = ""
+    if pending:
+        if chunks and len(chunks[-1]) + len(pending) < max_chars:
+            chunks[-1] = _join(chunks[-1], pending)
+        else:
+            chunks.append(pending)
+    return chunks
@@ -0,0 +1,202 @@
+import atexit
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from utility.config_manager import get_settings, CacheSettings
+
+# Default location and limits for the persistent translation cache
+cache_file = os.path.join(os.path.dirname(__file__), "translation_cache.db")
+default_max_entries = 5000
+default_ttl_seconds = None  # None means cached translations never expire
+default_touch_batch = 200  # Hits whose last_used update is written in one go
+
+
+def normalize_source(text):
+    """Normalize source text so trivially different inputs share a cache entry"""
+    if text is None:
+        return None
+    # Unify unicode forms and collapse runs of whitespace
+    normalized = unicodedata.normalize('NFC', text)
+    return ' '.join(normalized.split())
+
+
+class TranslationCache:
+    """
+    SQLite-backed LRU cache of translations keyed by source text and target language.
+    A hit is a single indexed read: its last_used update is kept in memory and
+    written with the next put (before eviction), or once touch_batch hits pile up.
+    """
+
+    def __init__(self, path=cache_file, max_entries=default_max_entries, ttl_seconds=default_ttl_seconds,
+                 touch_batch=default_touch_batch):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.touch_batch = touch_batch
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = None
+        self._touched = {}  # (source, target_lang) -> last_used not yet written
+
+    def _connect(self):
+        # Open the database lazily so constructing the cache costs nothing
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " source TEXT NOT NULL,"
+                " target_lang TEXT NOT NULL,"
+                " translation TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_used REAL NOT NULL,"
+                " PRIMARY KEY (source, target_lang))"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations (last_used)"
+            )
+            self._connection.commit()
+        return self._connection
+
+    def get(self, text, target_lang):
+        """Return the cached translation or None on a miss"""
+        source = normalize_source(text)
+        target_lang = target_lang.upper()
+        now = time.time()
+        with self._lock:
+            try:
+                connection = self._connect()
+                row = connection.execute(
+                    "SELECT translation, created_at FROM translations WHERE source = ? AND target_lang = ?",
+                    (source, target_lang)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+
+                translation, created_at = row
+                if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                    # Expired entries are dropped and reported as a miss
+                    connection.execute(
+                        "DELETE FROM translations WHERE source = ? AND target_lang = ?",
+                        (source, target_lang)
+                    )
+                    connection.commit()
+                    self._touched.pop((source, target_lang), None)
+                    self.misses += 1
+                    return None
+
+                self._touched[(source, target_lang)] = now
+                if len(self._touched) >= self.touch_batch:
+                    self._write_touches(connection)
+                    connection.commit()
+                self.hits += 1
+                return translation
+            except sqlite3.Error as e:
+                print(f"Translation cache read error: {e}")
+                self.misses += 1
+                return None
+
+    def put(self, text, target_lang, translation):
+        """Store a translation and evict the least recently used entries if needed"""
+        source = normalize_source(text)
+        target_lang = target_lang.upper()
+        now = time.time()
+        with self._lock:
+            try:
+                connection = self._connect()
+                connection.execute(
+                    "INSERT OR REPLACE INTO translations (source, target_lang, translation, created_at, last_used)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (source, target_lang, translation, now, now)
+                )
+                self._touched.pop((source, target_lang), None)
+                # Recent hits must be on disk before eviction picks the least recently used
+                self._write_touches(connection)
+                self._evict(connection)
+                connection.commit()
+            except sqlite3.Error as e:
+                print(f"Translation cache write error: {e}")
+
+    def _write_touches(self, connection):
+        if self._touched:
+            connection.executemany(
+                "UPDATE translations SET last_used = ? WHERE source = ? AND target_lang = ?",
+                [(last_used, source, target_lang) for (source, target_lang), last_used in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _evict(self, connection):
+        if self.max_entries is None:
+            return
+        count = connection.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            connection.execute(
+                "DELETE FROM translations WHERE rowid IN ("
+                " SELECT rowid FROM translations ORDER BY last_used ASC LIMIT ?)",
+                (excess,)
+            )
+
+    def clear(self):
+        """Remove every cached translation and reset the counters"""
+        with self._lock:
+            try:
+                connection = self._connect()
+                connection.execute("DELETE FROM translations")
+                connection.commit()
+                self._touched.clear()
+            except sqlite3.Error as e:
+                print(f"Translation cache clear error: {e}")
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return hit/miss counters and the current number of entries"""
+        with self._lock:
+            try:
+                size = self._connect().execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+            except sqlite3.Error:
+                size = 0
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": size,
+                "hit_rate": self.hits / total if total else 0.0
+            }
+
+    def close(self):
+        """Write pending last_used updates and close the database"""
+        with self._lock:
+            if self._connection is not None:
+                try:
+                    self._write_touches(self._connection)
+                    self._connection.commit()
+                except sqlite3.Error as e:
+                    print(f"Translation cache write error: {e}")
+                self._connection.close()
+                self._connection = None
+
+
+_translation_cache = None
+_translation_cache_lock = threading.Lock()
+
+
+def get_translation_cache():
+    """Return the shared translation cache, creating it on first use"""
+    global _translation_cache
+    with _translation_cache_lock:
+        if _translation_cache is None:
+            settings = get_settings(CacheSettings)
+            _translation_cache = TranslationCache(
+                max_entries=settings.translation_max_entries,
+                ttl_seconds=settings.translation_ttl_seconds
+            )
+            # Recent hits keep their LRU position across restarts
+            atexit.register(_translation_cache.close)
+        return _translation_cache
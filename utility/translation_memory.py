@@ -0,0 +1,260 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from utility.config_manager import get_settings, TranslationMemorySettings
+from utility.text_normalization import normalize
+
+# Default location and limits for the translation memory
+memory_file = os.path.join(os.path.dirname(__file__), "translation_memory.db")
+default_max_segments = 2000000
+default_min_score = 0.75
+default_max_candidates = 2000  # Candidates scored per lookup, whatever the memory's size
+max_indexed_chars = 1000  # Only the start of very long segments is indexed
+eviction_fraction = 0.01  # Share of segments dropped at once when the memory is full
+_sql_batch = 500  # Parameters per IN (...) query
+
+MemoryMatch = namedtuple("MemoryMatch", "source translation score")
+
+
+def normalize_segment(text):
+    """Form used for matching: casefolded, without punctuation or accents, single-spaced"""
+    return normalize(text) or ""
+
+
+def trigrams(normalized):
+    """Set of character trigrams, padded so word starts and ends count"""
+    padded = f"  {normalized[:max_indexed_chars]} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def dice(a, b):
+    if not a and not b:
+        return 1.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def _batches(items, size=_sql_batch):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class TranslationMemory:
+    """
+    Every source/translation pair seen, in SQLite with a character-trigram inverted index.
+    Lookups only read the postings of the query's rarest trigrams, score a bounded
+    number of candidates, and never load the memory itself, so memory use stays
+    flat as it grows to millions of segments.
+    """
+
+    def __init__(self, path=memory_file, max_segments=default_max_segments,
+                 max_candidates=default_max_candidates):
+        self.path = path
+        self.max_segments = max_segments
+        self.max_candidates = max_candidates
+        self.hits = 0
+        self.misses = 0
+        self._count = None
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(
+                "CREATE TABLE IF NOT EXISTS segments ("
+                " id INTEGER PRIMARY KEY,"
+                " target_lang TEXT NOT NULL,"
+                " normalized TEXT NOT NULL,"
+                " source TEXT NOT NULL,"
+                " translation TEXT NOT NULL,"
+                " last_used REAL NOT NULL,"
+                " UNIQUE (target_lang, normalized));"
+                "CREATE INDEX IF NOT EXISTS idx_segments_last_used ON segments (last_used);"
+                # Inverted index: trigram -> segments containing it
+                "CREATE TABLE IF NOT EXISTS postings ("
+                " target_lang TEXT NOT NULL,"
+                " trigram TEXT NOT NULL,"
+                " segment_id INTEGER NOT NULL,"
+                " PRIMARY KEY (target_lang, trigram, segment_id)) WITHOUT ROWID;"
+                # How many segments contain each trigram, to find the rarest ones
+                "CREATE TABLE IF NOT EXISTS trigram_counts ("
+                " target_lang TEXT NOT NULL,"
+                " trigram TEXT NOT NULL,"
+                " segments INTEGER NOT NULL,"
+                " PRIMARY KEY (target_lang, trigram)) WITHOUT ROWID;"
+            )
+            self._connection.commit()
+        return self._connection
+
+    def add(self, source, target_lang, translation):
+        """Remember a translation; re-adding a segment refreshes its translation"""
+        normalized = normalize_segment(source or "")
+        if not normalized or not translation:
+            return
+        target_lang = target_lang.upper()
+        now = time.time()
+        with self._lock:
+            try:
+                connection = self._connect()
+                with connection:
+                    row = connection.execute(
+                        "SELECT id FROM segments WHERE target_lang = ? AND normalized = ?",
+                        (target_lang, normalized)
+                    ).fetchone()
+                    if row is not None:
+                        connection.execute(
+                            "UPDATE segments SET source = ?, translation = ?, last_used = ? WHERE id = ?",
+                            (source, translation, now, row[0])
+                        )
+                        return
+                    segment_id = connection.execute(
+                        "INSERT INTO segments (target_lang, normalized, source, translation, last_used)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        (target_lang, normalized, source, translation, now)
+                    ).lastrowid
+                    self._index(connection, target_lang, segment_id, trigrams(normalized), 1)
+                    if self._count is not None:
+                        self._count += 1
+                self._evict(connection)
+            except sqlite3.Error as e:
+                print(f"Translation memory error: {e}")
+
+    def _index(self, connection, target_lang, segment_id, grams, delta):
+        rows = [(target_lang, gram, segment_id) for gram in grams]
+        if delta > 0:
+            connection.executemany("INSERT OR IGNORE INTO postings VALUES (?, ?, ?)", rows)
+            connection.executemany(
+                "INSERT INTO trigram_counts VALUES (?, ?, 1)"
+                " ON CONFLICT (target_lang, trigram) DO UPDATE SET segments = segments + 1",
+                [(target_lang, gram) for gram in grams]
+            )
+        else:
+            connection.executemany(
+                "DELETE FROM postings WHERE target_lang = ? AND trigram = ? AND segment_id = ?", rows
+            )
+            connection.executemany(
+                "UPDATE trigram_counts SET segments = segments - 1 WHERE target_lang = ? AND trigram = ?",
+                [(target_lang, gram) for gram in grams]
+            )
+
+    def _evict(self, connection):
+        # Keep the memory bounded by dropping the least recently used segments in bulk
+        if self._count is None:
+            self._count = connection.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+        if self._count <= self.max_segments:
+            return
+        excess = self._count - self.max_segments + max(1, int(self.max_segments * eviction_fraction))
+        with connection:
+            victims = connection.execute(
+                "SELECT id, target_lang, normalized FROM segments ORDER BY last_used LIMIT ?", (excess,)
+            ).fetchall()
+            for segment_id, target_lang, normalized in victims:
+                self._index(connection, target_lang, segment_id, trigrams(normalized), -1)
+            connection.executemany("DELETE FROM segments WHERE id = ?", [(victim[0],) for victim in victims])
+            connection.execute("DELETE FROM trigram_counts WHERE segments <= 0")
+        self._count -= len(victims)
+
+    def lookup(self, text, target_lang, min_score=default_min_score):
+        """Return the closest stored MemoryMatch scoring at least min_score, or None"""
+        normalized = normalize_segment(text or "")
+        if not normalized:
+            return None
+        target_lang = target_lang.upper()
+        with self._lock:
+            try:
+                match = self._lookup(self._connect(), normalized, target_lang, min_score)
+            except sqlite3.Error as e:
+                print(f"Translation memory error: {e}")
+                match = None
+            if match is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return match
+
+    def _lookup(self, connection, normalized, target_lang, min_score):
+        exact = connection.execute(
+            "SELECT id, source, translation FROM segments WHERE target_lang = ? AND normalized = ?",
+            (target_lang, normalized)
+        ).fetchone()
+        if exact is not None:
+            connection.execute("UPDATE segments SET last_used = ? WHERE id = ?", (time.time(), exact[0]))
+            connection.commit()
+            return MemoryMatch(exact[1], exact[2], 1.0)
+
+        query = trigrams(normalized)
+        counts = {}
+        for batch in _batches(query):
+            counts.update(connection.execute(
+                f"SELECT trigram, segments FROM trigram_counts WHERE target_lang = ?"
+                f" AND trigram IN ({','.join('?' * len(batch))})",
+                [target_lang] + batch
+            ).fetchall())
+        if not counts:
+            return None
+
+        # A segment scoring min_score (Dice) shares at least `needed` of the query's
+        # trigrams, so it must contain one of the n - needed + 1 rarest of them
+        needed = math.ceil(min_score * len(query) / (2 - min_score))
+        rarest = sorted(counts, key=counts.get)[:max(1, len(query) - needed + 1)]
+
+        candidates = set()
+        for gram in rarest:
+            remaining = self.max_candidates - len(candidates)
+            if remaining <= 0:
+                break
+            candidates.update(row[0] for row in connection.execute(
+                "SELECT segment_id FROM postings WHERE target_lang = ? AND trigram = ? LIMIT ?",
+                (target_lang, gram, remaining)
+            ))
+
+        best = None
+        for batch in _batches(candidates):
+            for segment_id, candidate, source, translation in connection.execute(
+                f"SELECT id, normalized, source, translation FROM segments"
+                f" WHERE id IN ({','.join('?' * len(batch))})",
+                batch
+            ):
+                score = dice(query, trigrams(candidate))
+                if score >= min_score and (best is None or score > best[0]):
+                    best = (score, segment_id, source, translation)
+        if best is None:
+            return None
+        connection.execute("UPDATE segments SET last_used = ? WHERE id = ?", (time.time(), best[1]))
+        connection.commit()
+        return MemoryMatch(best[2], best[3], best[0])
+
+    def stats(self):
+        with self._lock:
+            connection = self._connect()
+            if self._count is None:
+                self._count = connection.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+            return {"segments": self._count, "max_segments": self.max_segments,
+                    "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+_translation_memory = None
+_translation_memory_lock = threading.Lock()
+
+
+def get_translation_memory():
+    """Return the shared translation memory, creating it on first use"""
+    global _translation_memory
+    with _translation_memory_lock:
+        if _translation_memory is None:
+            settings = get_settings(TranslationMemorySettings)
+            _translation_memory = TranslationMemory(max_segments=settings.max_segments)
+        return _translation_memory
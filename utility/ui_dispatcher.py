@@ -0,0 +1,112 @@
+import threading
+from collections import deque
+
+default_interval_ms = 16  # Roughly one frame at 60 Hz
+default_max_batch = 200   # Upper bound on updates applied per drain
+
+
+class UIDispatcher:
+    """Queue widget updates from worker threads and apply them in batches on the Tk main loop"""
+
+    def __init__(self, root, interval_ms=default_interval_ms, max_batch=default_max_batch):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.max_batch = max_batch
+        self._queue = deque()
+        self._coalesced = {}  # key -> latest (fn, args, kwargs) waiting in the queue
+        self._lock = threading.Lock()
+        self._after_id = None
+        self._running = False
+
+    def start(self):
+        if not self._running:
+            self._running = True
+            self._schedule()
+
+    def stop(self):
+        self._running = False
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def post(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the UI thread during the next drain"""
+        with self._lock:
+            self._queue.append((None, fn, args, kwargs))
+
+    def post_coalesced(self, key, fn, *args, **kwargs):
+        """
+        Like post, but updates sharing a key are merged: only the latest
+        one runs, in the queue position of the first.
+        """
+        with self._lock:
+            if key not in self._coalesced:
+                self._queue.append((key, None, None, None))
+            self._coalesced[key] = (fn, args, kwargs)
+
+    def _schedule(self):
+        try:
+            self._after_id = self.root.after(self.interval_ms, self._drain)
+        except Exception:
+            # The window is gone; nothing left to update
+            self._running = False
+
+    def _drain(self):
+        self._after_id = None
+        batch = []
+        with self._lock:
+            while self._queue and len(batch) < self.max_batch:
+                key, fn, args, kwargs = self._queue.popleft()
+                if key is not None:
+                    fn, args, kwargs = self._coalesced.pop(key)
+                batch.append((fn, args, kwargs))
+
+        for fn, args, kwargs in batch:
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                print(f"UI update {getattr(fn, '__name__', fn)} failed: {e!r}")
+
+        if self._running:
+            self._schedule()
+
+
+_dispatcher = None
+
+
+def install_dispatcher(root, **kwargs):
+    """Create and start the dispatcher that drains into root's main loop"""
+    global _dispatcher
+    _dispatcher = UIDispatcher(root, **kwargs)
+    _dispatcher.start()
+    return _dispatcher
+
+
+def get_dispatcher():
+    return _dispatcher
+
+
+def call_in_ui(fn, *args, **kwargs):
+    """Schedule fn on the UI thread, or call it directly if no dispatcher is running"""
+    if _dispatcher is None:
+        fn(*args, **kwargs)
+    else:
+        _dispatcher.post(fn, *args, **kwargs)
+
+
+def call_in_ui_coalesced(key, fn, *args, **kwargs):
+    """Schedule fn on the UI thread, replacing any pending update with the same key"""
+    if _dispatcher is None:
+        fn(*args, **kwargs)
+    else:
+        _dispatcher.post_coalesced(key, fn, *args, **kwargs)
+
+
+def ui_callback(fn):
+    """Wrap a callback so that calling it from a worker thread runs it on the UI thread"""
+    def wrapper(*args, **kwargs):
+        call_in_ui(fn, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,192 @@
+import math
+import sys
+import wave
+from array import array
+from collections import deque
+
+# Endpointing defaults
+default_frame_ms = 30
+default_hangover_ms = 400      # Trailing silence that ends an utterance
+default_min_speech_ms = 90     # Speech needed before an utterance is considered started
+default_pre_roll_ms = 300      # Audio kept from just before speech started
+
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+
+def frame_rms(frame, sample_width=2):
+    """Root-mean-square amplitude of a frame of 16-bit little-endian PCM"""
+    samples = _samples(frame, sample_width)
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+def frame_zcr(frame, sample_width=2):
+    """Fraction of adjacent sample pairs whose sign changes"""
+    samples = _samples(frame, sample_width)
+    if len(samples) < 2:
+        return 0.0
+    crossings = 0
+    previous = samples[0] >= 0
+    for sample in samples:
+        current = sample >= 0
+        if current != previous:
+            crossings += 1
+        previous = current
+    return crossings / (len(samples) - 1)
+
+
+def _samples(frame, sample_width):
+    if sample_width != 2:
+        raise ValueError("Only 16-bit audio is supported")
+    samples = array("h")
+    samples.frombytes(frame[:len(frame) - len(frame) % 2])
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return samples
+
+
+class EnergyZcrVad:
+    """
+    Frame classifier using energy plus zero-crossing rate.
+    Loud frames are speech; quieter frames with a high crossing rate are
+    treated as unvoiced consonants (s, f, ch) rather than silence.
+    """
+
+    def __init__(self, energy_threshold=300.0, fricative_zcr=0.25, fricative_energy_ratio=0.5,
+                 noise_ratio=2.5, noise_adapt=0.05, sample_width=2):
+        self.energy_threshold = energy_threshold
+        self.fricative_zcr = fricative_zcr
+        self.fricative_energy_ratio = fricative_energy_ratio
+        self.noise_ratio = noise_ratio
+        self.noise_adapt = noise_adapt
+        self.sample_width = sample_width
+        self.noise_floor = None
+
+    def threshold(self):
+        if self.noise_floor is None:
+            return self.energy_threshold
+        return max(self.energy_threshold, self.noise_floor * self.noise_ratio)
+
+    def is_speech(self, frame):
+        energy = frame_rms(frame, self.sample_width)
+        threshold = self.threshold()
+        if energy >= threshold:
+            return True
+        if energy >= threshold * self.fricative_energy_ratio and \
+                frame_zcr(frame, self.sample_width) >= self.fricative_zcr:
+            return True
+
+        # Track the background level from frames classified as silence
+        if self.noise_floor is None:
+            self.noise_floor = energy
+        else:
+            self.noise_floor += (energy - self.noise_floor) * self.noise_adapt
+        return False
+
+
+class WebRtcVad:
+    """Frame classifier backed by the optional webrtcvad package"""
+
+    def __init__(self, sample_rate, aggressiveness=2):
+        if webrtcvad is None:
+            raise RuntimeError("webrtcvad is not installed")
+        if sample_rate not in (8000, 16000, 32000, 48000):
+            raise ValueError(f"WebRTC VAD does not support {sample_rate} Hz audio")
+        self.sample_rate = sample_rate
+        self._vad = webrtcvad.Vad(aggressiveness)
+
+    def is_speech(self, frame):
+        return self._vad.is_speech(frame, self.sample_rate)
+
+
+def create_vad(sample_rate, energy_threshold=300.0, engine="auto"):
+    """Return a WebRTC VAD when requested and available, otherwise the energy/ZCR VAD"""
+    if engine in ("webrtc", "auto") and webrtcvad is not None:
+        try:
+            return WebRtcVad(sample_rate)
+        except ValueError:
+            if engine == "webrtc":
+                raise
+    elif engine == "webrtc":
+        raise RuntimeError("webrtcvad is not installed")
+    return EnergyZcrVad(energy_threshold=energy_threshold)
+
+
+class Endpointer:
+    """Find the start and end of an utterance from a stream of classified frames"""
+
+    def __init__(self, vad, frame_ms=default_frame_ms, hangover_ms=default_hangover_ms,
+                 min_speech_ms=default_min_speech_ms, pre_roll_ms=default_pre_roll_ms):
+        self.vad = vad
+        self.frame_ms = frame_ms
+        self.hangover_ms = hangover_ms
+        self.min_speech_ms = min_speech_ms
+        self._pre_roll = deque(maxlen=max(1, int(pre_roll_ms / frame_ms)))
+        self.frames = []
+        self.started = False
+        self.ended = False
+        self.elapsed_ms = 0
+        self.speech_start_ms = None
+        self.speech_end_ms = None
+        self._speech_run_ms = 0
+        self._silence_run_ms = 0
+
+    def process(self, frame):
+        """Feed one frame; returns True once the utterance has ended"""
+        if self.ended:
+            return True
+        self.elapsed_ms += self.frame_ms
+        speech = self.vad.is_speech(frame)
+
+        if not self.started:
+            self._pre_roll.append(frame)
+            if speech:
+                self._speech_run_ms += self.frame_ms
+                if self._speech_run_ms >= self.min_speech_ms:
+                    self.started = True
+                    self.speech_start_ms = self.elapsed_ms - self._speech_run_ms
+                    self.frames.extend(self._pre_roll)
+                    self._pre_roll.clear()
+            else:
+                self._speech_run_ms = 0
+            return False
+
+        self.frames.append(frame)
+        if speech:
+            self._silence_run_ms = 0
+        else:
+            self._silence_run_ms += self.frame_ms
+            if self._silence_run_ms >= self.hangover_ms:
+                self.ended = True
+                self.speech_end_ms = self.elapsed_ms - self._silence_run_ms
+        return self.ended
+
+    def audio(self):
+        return b"".join(self.frames)
+
+
+def endpoint_wav(path, hangover_ms=default_hangover_ms, frame_ms=default_frame_ms,
+                 energy_threshold=300.0, engine="energy"):
+    """
+    Run the endpointer over a 16-bit mono WAV recording.
+    Returns (speech_start_ms, speech_end_ms, endpoint_ms); values are None if not reached.
+    endpoint_ms is when a live recording would have stopped listening.
+    """
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2 or wav.getnchannels() != 1:
+            raise ValueError("Expected a 16-bit mono WAV file")
+        sample_rate = wav.getframerate()
+        frame_samples = int(sample_rate * frame_ms / 1000)
+        vad = create_vad(sample_rate, energy_threshold, engine)
+        endpointer = Endpointer(vad, frame_ms=frame_ms, hangover_ms=hangover_ms)
+        while True:
+            frame = wav.readframes(frame_samples)
+            if len(frame) < frame_samples * 2:
+                break
+            if endpointer.process(frame):
+                return endpointer.speech_start_ms, endpointer.speech_end_ms, endpointer.elapsed_ms
+    return endpointer.speech_start_ms, endpointer.speech_end_ms, None